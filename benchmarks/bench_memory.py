@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Memory benchmark: bytes allocated for every scored bowling game.
+Run from the repository root: python -m benchmarks.bench_memory --games 20000
+To compare with another version of bowling.py run it from that checkout:
+cd /path/to/other/checkout && PYTHONPATH=/path/to/this/checkout python -m benchmarks.bench_memory
+"""
+import argparse
+import random
+import tracemalloc
+
+import bowling as bw
+from benchmarks.synthetic import random_game
+
+
+def measure(games, local_rules):
+    """
+    :return: tuple (bytes kept by one scored Bowling object, peak bytes per game while scoring)
+    """
+    tracemalloc.start()
+    kept = []
+    before = tracemalloc.get_traced_memory()[0]
+    for game in games:
+        bowling = bw.Bowling(game, local_rules=local_rules)
+        bowling.check_result()
+        kept.append(bowling)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - before) / len(games), (peak - before) / len(games)
+
+
+def main():
+    parser = argparse.ArgumentParser('Bowling memory benchmark')
+    parser.add_argument('--games', type=int, default=20000, help='Amount of scored games')
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    games = [random_game(rnd) for _ in range(args.games)]
+    print(f'bowling module: {bw.__file__}')
+    for local_rules in (True, False):
+        kept, peak = measure(games, local_rules)
+        print(f'local_rules={local_rules!s:5}  bytes per scored game: {kept:8.1f}  peak per game: {peak:8.1f}')
+
+
+if __name__ == '__main__':
+    main()
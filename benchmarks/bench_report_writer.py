@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of report writing: reopening output file for every line vs one buffered ReportWriter.
+Run from the repository root: python -m benchmarks.bench_report_writer --lines 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import bowling_tournament as bt
+from benchmarks.synthetic import write_tournament
+
+
+def run(input_file, output_file, flush_size):
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    tournament = bt.BowlingTournament(input_file, output_file, local_rules=False, flush_size=flush_size)
+    started = time.perf_counter()
+    tournament.analyze_input_file()
+    return time.perf_counter() - started
+
+
+def reopen_per_line(lines, output_file):
+    """ How the report was written before: one open() per line"""
+    started = time.perf_counter()
+    for line in lines:
+        with open(output_file, 'a', encoding='UTF8') as report_file:
+            report_file.write(line)
+    return time.perf_counter() - started
+
+
+def buffered(lines, output_file, flush_size):
+    started = time.perf_counter()
+    with bt.ReportWriter(output_file, flush_size=flush_size) as report:
+        for line in lines:
+            report.write(line)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser('Report writer benchmark')
+    parser.add_argument('--lines', type=int, default=100000, help='Lines in synthetic tournament file')
+    parser.add_argument('--flush_size', type=int, default=1000, help='Lines collected before writing')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, 'tournament.txt')
+        report_file = os.path.join(tmp, 'report.txt')
+        write_tournament(input_file, args.lines)
+        tournament_time = run(input_file, report_file, args.flush_size)
+        with open(report_file, encoding='UTF8') as file:
+            lines = file.readlines()
+
+        reopen_file = os.path.join(tmp, 'reopen.txt')
+        buffered_file = os.path.join(tmp, 'buffered.txt')
+        reopen_time = reopen_per_line(lines, reopen_file)
+        buffered_time = buffered(lines, buffered_file, args.flush_size)
+        with open(reopen_file, 'rb') as first, open(buffered_file, 'rb') as second:
+            identical = first.read() == second.read()
+
+    print(f'report lines:            {len(lines)}')
+    print(f'reopen per line:         {reopen_time:.3f} s')
+    print(f'ReportWriter:            {buffered_time:.3f} s ({reopen_time / max(buffered_time, 1e-9):.1f}x)')
+    print(f'byte-identical output:   {identical}')
+    print(f'whole tournament run:    {tournament_time:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark for console scripts, results are printed as JSON.
+Run from the repository root:
+    python -m benchmarks.bench_startup --output startup.json
+    python -m benchmarks.bench_startup --repeat 30
+Every command is run in a fresh interpreter: wall time is the best of several runs,
+import times are taken from one more run with -X importtime.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOURNAMENT_FILE = os.path.join(ROOT, 'tournament.txt')
+
+
+def commands(output_dir):
+    """ Console commands to measure: name -> arguments of python"""
+    return {
+        'single_help': ['single_game_console_access.py', '--help'],
+        'single_game': ['single_game_console_access.py', '-r', '1/X3-5/X8154-57/X', '-l', 'true'],
+        'tournament_help': ['tournament_game_console_access.py', '--help'],
+        'tournament': ['tournament_game_console_access.py', '-i', TOURNAMENT_FILE,
+                       '-o', os.path.join(output_dir, 'result.txt')],
+        'import_single': ['-c', 'import single_game_console_access'],
+        'import_tournament': ['-c', 'import tournament_game_console_access'],
+    }
+
+
+def wall_time(arguments, repeat):
+    """ Best time of several runs of the command, milliseconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 2)
+
+
+def import_times(arguments, top=10):
+    """
+    Import time of top level modules, by -X importtime
+    :return: dict with total microseconds and the slowest modules with their cumulative microseconds
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=ROOT,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            # nested imports are indented, their time is already in cumulative time of the top module
+            modules[name.strip()] = int(cumulative)
+    slowest = sorted(modules.items(), key=lambda item: -item[1])[:top]
+    return {'total_us': sum(modules.values()), 'modules': dict(slowest)}
+
+
+def main():
+    parser = argparse.ArgumentParser('Startup benchmark of console scripts')
+    parser.add_argument('--repeat', type=int, default=15, help='Runs of every command, the best one is taken')
+    parser.add_argument('--output', help='Where to write JSON, stdout by default')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        results = {}
+        for name, arguments in commands(output_dir).items():
+            results[name] = {'wall_ms': wall_time(arguments, args.repeat), 'imports': import_times(arguments)}
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'bytecode_cache': not sys.dont_write_bytecode,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'baseline_ms': wall_time(['-c', 'pass'], args.repeat),
+        'commands': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='UTF8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
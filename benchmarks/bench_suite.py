@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for scoring engines and tournament processing, results are printed as JSON.
+Run from the repository root:
+    python -m benchmarks.bench_suite --output bench.json
+    python -m benchmarks.bench_suite --games 2000 --sizes 1000,100000
+Every tournament size is processed in a separate interpreter, so its peak memory is measured alone.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import bowling as bw
+import bowling_engine as be
+from benchmarks.synthetic import GAMES, make_games, write_tournament
+
+DEFAULT_SIZES = '1000,100000,10000000'
+
+
+def _bowling(games, local_rules):
+    for game in games:
+        bw.Bowling(game, local_rules=local_rules).check_result()
+
+
+def _engine(games, local_rules):
+    for game in games:
+        be.score_game(game, local_rules)
+
+
+def engines():
+    """ Engines to compare, NumPy is imported only here to keep tournament child processes small"""
+    import bowling_vectorized as bv
+    result = {
+        'bowling': _bowling,
+        'engine': _engine,
+        'engine_batch': be.score_many,
+        'engine_scorecards': be.scorecards,
+    }
+    if bv.np is not None:
+        result['numpy'] = bv.score_many
+    return result
+
+
+def time_games(games, engine, local_rules, repeat=3):
+    """ Best time of several runs, seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine(games, local_rules)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_games(amount):
+    results = []
+    for kind in GAMES:
+        games = make_games(kind, amount)
+        for name, engine in engines().items():
+            for local_rules in (True, False):
+                seconds = time_games(games, engine, local_rules)
+                results.append({'kind': kind, 'engine': name, 'local_rules': local_rules, 'games': amount,
+                                'seconds': round(seconds, 6), 'ns_per_game': round(seconds / amount * 1e9, 1)})
+    return results
+
+
+def peak_rss_kb():
+    """ Peak resident memory of this process, ru_maxrss of an exec'ed child also counts the parent on Linux"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_tournament(input_file, local_rules, workers, memory_map):
+    """ Tournament run in this process, used by the child interpreter"""
+    import bowling_tournament as bt
+    tournament = bt.BowlingTournament(input_file, os.devnull, local_rules=local_rules, workers=workers,
+                                      memory_map=memory_map)
+    started = time.perf_counter()
+    tournament.analyze_input_file()
+    seconds = time.perf_counter() - started
+    return {'seconds': round(seconds, 6), 'tours': tournament.tour_counter,
+            'peak_rss_kb': peak_rss_kb()}
+
+
+def bench_tournament(sizes, local_rules, workers, memory_map):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            input_file = os.path.join(tmp, f'tournament_{size}.txt')
+            lines = write_tournament(input_file, size)
+            child = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_suite', '--tournament_child', input_file,
+                 '--local_rules', str(local_rules), '--workers', str(workers)]
+                + (['--memory_map'] if memory_map else []),
+                check=True, capture_output=True, text=True)
+            result = json.loads(child.stdout.splitlines()[-1])
+            result.update({'lines': lines, 'bytes': os.path.getsize(input_file), 'local_rules': local_rules,
+                           'workers': workers, 'memory_map': memory_map})
+            result['lines_per_second'] = round(lines / max(result['seconds'], 1e-9))
+            results.append(result)
+            os.remove(input_file)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser('Bowling benchmark suite')
+    parser.add_argument('--games', type=int, default=10000, help='Games of each kind for engine benchmarks')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma separated lines in tournament files')
+    parser.add_argument('--workers', type=int, default=1, help='Processes for tournament runs')
+    parser.add_argument('--memory_map', action='store_true', help='Read tournament files through mmap')
+    parser.add_argument('--output', help='Where to write JSON, stdout by default')
+    parser.add_argument('--tournament_child', help=argparse.SUPPRESS)
+    parser.add_argument('--local_rules', default='True', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.tournament_child:
+        print(json.dumps(run_tournament(args.tournament_child, args.local_rules == 'True', args.workers,
+                                        args.memory_map)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': 'numpy' in engines(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'games': bench_games(args.games),
+        'tournament': [result for local_rules in (True, False)
+                       for result in bench_tournament(sizes, local_rules, args.workers, args.memory_map)],
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='UTF8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
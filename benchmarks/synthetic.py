@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic bowling data for benchmarks: game results and tournament files in tournament.txt format.
+"""
+import random
+
+PLAYERS = ('Алексей', 'Татьяна', 'Давид', 'Павел', 'Роман', 'Ольга', 'Иван', 'Мария')
+
+
+def random_game(rnd):
+    """ Random correct game result of 10 frames"""
+    frames = []
+    for _ in range(10):
+        first = rnd.randint(0, 10)
+        if first == 10:
+            frames.append('X')
+            continue
+        second = rnd.randint(0, 10 - first)
+        first_symbol = str(first) if first else '-'
+        if first + second == 10:
+            frames.append(f'{first_symbol}/')
+        else:
+            frames.append(f'{first_symbol}{second if second else "-"}')
+    return ''.join(frames)
+
+
+def all_strike(rnd=None):
+    return 'X' * 10
+
+
+def all_spare(rnd=None):
+    return '5/' * 10
+
+
+def gutter(rnd=None):
+    return '-' * 20
+
+
+GAMES = {
+    'all_strike': all_strike,
+    'all_spare': all_spare,
+    'gutter': gutter,
+    'random': random_game,
+}
+
+
+def make_games(kind, amount, seed=0):
+    """ List of game results of one kind from GAMES"""
+    rnd = random.Random(seed)
+    make_game = GAMES[kind]
+    return [make_game(rnd) for _ in range(amount)]
+
+
+def write_tournament(path, lines, players=PLAYERS, seed=0):
+    """
+    Write tournament file with about `lines` lines
+    :param path: where to write the file
+    :param lines: approximate amount of lines in the file
+    :param players: player names, each tour has all of them
+    :param seed: random seed, the same seed gives the same file
+    :return: amount of written lines
+    """
+    rnd = random.Random(seed)
+    tour_lines = len(players) + 3
+    tours = max(1, lines // tour_lines)
+    with open(path, 'w', encoding='UTF8') as file:
+        for tour in range(1, tours + 1):
+            file.write(f'### Tour {tour}\n')
+            for player in players:
+                file.write(f'{player}\t{random_game(rnd)}\n')
+            file.write('winner is .........\n\n')
+    return tours * tour_lines
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import time
 from abc import ABC, abstractmethod
 
+import bowling_engine as be
+import bowling_metrics as bm
+
 AVAILABLE_SYMBOLS = ('1', '2', '3', '4', '5', '6', '7', '8', '9', '-', 'X', 'x', '/')
 POINTS = {
     '1': 1,
@@ -18,23 +22,30 @@ POINTS = {
     'x': 20,
     'X': 20,
 }
+# throw code from bowling_engine.CODE_MAP -> symbol
+SYMBOLS = ('-', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'X', '/')
 
 
 class Bowling:
     """
     Class that get bowling game result and count points of it according to rules that user want to use.
     The game contains 10 frames, each frame has a maximum of two throws.
+    Throws are kept as bytes of codes: pins 0-9, 10 - strike, 11 - spare.
     """
-    _state = None
-    _game_state = None
+    __slots__ = ('game_result_to_check', 'game_result', 'total_result', 'frame_result', 'frames_counter', 'bonus',
+                 'spare_points', 'symbol', 'after_strike_first', 'after_strike_second', 'after_spare',
+                 'error', 'error_position', '_state', '_game_state', '_states')
 
     def __init__(self, result, local_rules=True):
         """
         :param result: bowling game result
         :param local_rules: counting result rules: local(True) or tournament(False)
         """
+        metrics = bm.ACTIVE
+        if metrics is not None:
+            started = time.perf_counter()
         self.game_result_to_check = result
-        self.game_result = []
+        self.game_result = result.encode('utf-8').translate(be.CODE_MAP)
         self.total_result = 0
         self.frame_result = 0
         self.frames_counter = 0
@@ -44,14 +55,17 @@ class Bowling:
         self.after_strike_first = False
         self.after_strike_second = False
         self.after_spare = False
+        self.error = be.ERR_OK
+        self.error_position = None
+        self._states = []
         if local_rules:
             self.game_state(LocalGame())
-            self.change_state(FirstState())
+            self.switch_state(FirstState)
         else:
             self.game_state(ChampGame())
-            self.change_state(NewRulesFirst())
-        for symbol in self.game_result_to_check:
-            self.game_result.append(symbol)
+            self.switch_state(NewRulesFirst)
+        if metrics is not None:
+            metrics.add_time('bowling_init', time.perf_counter() - started)
 
     def game_state(self, game_state):
         """ Changing counting rules"""
@@ -63,30 +77,52 @@ class Bowling:
         self._state = state
         self._state.context = self
 
-    def check_result(self):
-        """ Checking if user input is correct"""
-        try:
-            for symbol in self.game_result:
-                if symbol not in AVAILABLE_SYMBOLS:
-                    raise ValueError(f'Symbol {symbol} is not available')
-            if len(self.game_result) < 10 or len(self.game_result) > 20:
-                raise ValueError(f'Incorrect amount of symbols, expected from 10 to 20,'
-                                 f' got {len(self.game_result)}')
-        except ValueError as err:
-            print(f'{err}')
+    def switch_state(self, state_class):
+        """ Changing throw states, each state object is made once per game"""
+        for state in self._states:
+            if type(state) is state_class:
+                break
         else:
-            try:
-                self._game_state.run()
-                if self.frames_counter != 10:
-                    raise ValueError(
-                        f'The game should have 10 frames, there is only {self.frames_counter}')
-            except ValueError as err:
-                print(f'{err}')
-            except AttributeError as err:
-                print(f'{err}')
+            state = state_class()
+            state.context = self
+            self._states.append(state)
+        self._state = state
+
+    def check_result(self, validate_only=False):
+        """
+        Checking if user input is correct and counting points of correct game.
+        Nothing is raised or printed, error code and index of the wrong throw are kept in error and error_position
+        :param validate_only: only check the game, points are not counted
+        :return: error code, bowling_engine.ERR_OK for correct game
+        """
+        metrics = bm.ACTIVE
+        if metrics is not None:
+            started = time.perf_counter()
+        local_rules = not isinstance(self._game_state, ChampGame)
+        self.error, self.error_position = be.validate(self.game_result_to_check, local_rules=local_rules)
+        if self.error == be.ERR_OK and not validate_only:
+            self._game_state.run()
+        if metrics is not None:
+            metrics.add_time('check_result', time.perf_counter() - started)
+        return self.error
+
+    def scorecard(self):
+        """
+        Cumulative points after every frame, counted by bowling_engine with the rules of this game
+        :return: array 'H' of 10 items, the last one is total_result, incorrect game gets zeros
+        """
+        local_rules = not isinstance(self._game_state, ChampGame)
+        return be.scorecard(self.game_result_to_check, local_rules=local_rules)[0]
+
+    @property
+    def error_message(self):
+        return be.error_message(self.error, self.error_position)
 
     def print_result(self):
-        print(f'Point for game score {self.game_result_to_check} is {self.total_result}')
+        if self.error != be.ERR_OK:
+            print(f'Game score {self.game_result_to_check} is incorrect: {self.error_message}')
+        else:
+            print(f'Point for game score {self.game_result_to_check} is {self.total_result}')
 
     """ Methods to plug in counting methods"""
     def regular_throw(self):
@@ -107,7 +143,9 @@ class State(ABC):
     Abstract class for choosing throw states.
     Each frame of game has a maximum of 2 throws.
     Each throw can be described with 2 states: first throw and second throw.
+    Instance __dict__ is made only if some attribute is replaced, e.g. a method is patched.
     """
+    __slots__ = ('_context', '__dict__')
 
     @property
     def context(self):
@@ -134,11 +172,12 @@ class FirstState(State):
     """
     Class describes a behaviour of first throw with local game rules.
     """
+    __slots__ = ()
 
     def regular_throw(self):
         self.context.frames_counter += 1
         self.context.frame_result += POINTS[self.context.symbol]
-        self.context.change_state(SecondState())
+        self.context.switch_state(SecondState)
 
     def strike(self):
         self.context.frames_counter += 1
@@ -154,6 +193,7 @@ class SecondState(State):
     """
     Class describes a behaviour of second throw with local game rules.
     """
+    __slots__ = ()
 
     def regular_throw(self):
         self.context.frame_result += POINTS[self.context.symbol]
@@ -161,7 +201,7 @@ class SecondState(State):
             raise ValueError("Frame result can't be more than 10 if it is not strike/spare")
         self.context.total_result += self.context.frame_result
         self.context.frame_result = 0
-        self.context.change_state(FirstState())
+        self.context.switch_state(FirstState)
 
     def strike(self):
         raise AttributeError("Second throw can't be strike")
@@ -170,13 +210,14 @@ class SecondState(State):
         self.context.frame_result = 15
         self.context.total_result += self.context.frame_result
         self.context.frame_result = 0
-        self.context.change_state(FirstState())
+        self.context.switch_state(FirstState)
 
 
 class NewRulesFirst(State):
     """
     Class describes a behaviour of second throw with tournament game rules.
     """
+    __slots__ = ()
 
     def regular_throw(self):
         self.context.frames_counter += 1
@@ -191,7 +232,7 @@ class NewRulesFirst(State):
         if self.context.after_spare:
             self.context.bonus += POINTS[self.context.symbol]
             self.context.after_spare = False
-        self.context.change_state(NewRulesSecond())
+        self.context.switch_state(NewRulesSecond)
 
     def strike(self):
         self.context.frames_counter += 1
@@ -218,6 +259,7 @@ class NewRulesSecond(State):
     """
     Class describes a behaviour of second throw with tournament game rules.
     """
+    __slots__ = ()
 
     def regular_throw(self):
         self.context.frame_result += POINTS[self.context.symbol]
@@ -226,7 +268,7 @@ class NewRulesSecond(State):
             self.context.bonus += POINTS[self.context.symbol]
             self.context.after_strike_second = False
         self.context.frame_result = 0
-        self.context.change_state(NewRulesFirst())
+        self.context.switch_state(NewRulesFirst)
 
     def strike(self):
         raise AttributeError("Second throw can't be strike")
@@ -240,13 +282,14 @@ class NewRulesSecond(State):
             self.context.after_strike_second = False
         self.context.frame_result = 0
         self.context.after_spare = True
-        self.context.change_state(NewRulesFirst())
+        self.context.switch_state(NewRulesFirst)
 
 
 class GameState(ABC):
     """
     Abstract class for choosing game mode: local or tournament
     """
+    __slots__ = ('_game_context', '__dict__')
 
     @property
     def game_context(self):
@@ -267,14 +310,15 @@ class LocalGame(GameState):
     Rules: «Х» – strike always 20 points, «4/» - spare always 15 points, «34» – sum 3+4=7, «-4» - sum 0+4=4
     Example: '1/X3-5/X8154-57/X' - 15 + 20 + 3 + 15 + 20 + 9 + 9 + 5 + 15 + 20 = 131
     """
+    __slots__ = ()
 
     def run(self):
 
-        for sym in self.game_context.game_result:
-            self.game_context.symbol = sym
-            if self.game_context.symbol == '/':
+        for code in self.game_context.game_result:
+            self.game_context.symbol = SYMBOLS[code]
+            if code == be.SPARE:
                 self.game_context._state.spare()
-            elif self.game_context.symbol == 'x' or self.game_context.symbol == 'X':
+            elif code == be.STRIKE:
                 self.game_context._state.strike()
             else:
                 self.game_context._state.regular_throw()
@@ -289,13 +333,14 @@ class ChampGame(GameState):
     if there was strike/spare in the last frame, points equals to number of pins knocked down this frame + 10
     Example: (10 + 10) + (10 + 3) + 3 + (10 + 10) + (10 + 9) + 9 + 9 + 5 + (10 + 10) + (10 + 10) = 138
     """
+    __slots__ = ()
 
     def run(self):
-        for sym in self.game_context.game_result:
-            self.game_context.symbol = sym
-            if self.game_context.symbol == '/':
+        for code in self.game_context.game_result:
+            self.game_context.symbol = SYMBOLS[code]
+            if code == be.SPARE:
                 self.game_context._state.spare()
-            elif self.game_context.symbol == 'x' or self.game_context.symbol == 'X':
+            elif code == be.STRIKE:
                 self.game_context._state.strike()
             else:
                 self.game_context._state.regular_throw()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Caches for bowling game points. Same game results repeat from tour to tour,
+so points are counted once and then taken from the cache.
+Results can be kept on disk between runs with DiskScoreCache.
+"""
+import sqlite3
+from collections import OrderedDict
+
+import bowling_engine as be
+
+
+class ScoreCache:
+    """
+    Memoizing cache (result, local_rules) -> (points, error code) with LRU eviction.
+    """
+
+    def __init__(self, max_size=4096, scorer=be.score_game):
+        """
+        :param max_size: how many game results can be kept in the cache
+        :param scorer: function (result, local_rules) -> (points, error code) used on cache miss
+        """
+        if max_size < 1:
+            raise ValueError(f'Cache size should be positive, got {max_size}')
+        self.max_size = max_size
+        self.scorer = scorer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def score(self, result, local_rules=True):
+        """
+        Get game points from the cache or count them
+        :param result: bowling game result
+        :param local_rules: counting result rules: local(True) or tournament(False)
+        :return: tuple (points, error code)
+        """
+        key = (result, local_rules)
+        items = self._items
+        try:
+            value = items[key]
+        except KeyError:
+            self.misses += 1
+            value = items[key] = self.scorer(result, local_rules)
+            if len(items) > self.max_size:
+                items.popitem(last=False)
+                self.evictions += 1
+            return value
+        items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def clear(self):
+        """ Drop cached results, counters stay as they are"""
+        self._items.clear()
+
+    def flush(self):
+        """ Nothing is kept on disk, the same interface as DiskScoreCache has"""
+
+    def stats(self):
+        return {'size': len(self._items), 'max_size': self.max_size, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+class DiskScoreCache:
+    """
+    Cache (result, local_rules) -> (points, error code) kept in SQLite file between runs.
+    Rows are keyed by result, rules and bowling_engine.ENGINE_VERSION, rows of other versions are dropped on open.
+    Cached results of a rule set are read at once when it is used first, new ones are written in batches.
+    When there are more than max_size rows, ones that were not used for the most runs are dropped.
+    """
+
+    def __init__(self, path, max_size=100000, scorer=be.score_game, batch_size=1000):
+        """
+        :param path: SQLite file, it is made if it doesn't exist
+        :param max_size: how many game results can be kept in the file
+        :param scorer: function (result, local_rules) -> (points, error code) used on cache miss
+        :param batch_size: how many new results are collected before writing them to the file
+        """
+        if max_size < 1:
+            raise ValueError(f'Cache size should be positive, got {max_size}')
+        self.path = path
+        self.max_size = max_size
+        self.scorer = scorer
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._loaded = {}
+        self._new = {}
+        self._touched = []
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS scores (result TEXT NOT NULL, local_rules INTEGER NOT NULL, '
+                             'version INTEGER NOT NULL, points INTEGER NOT NULL, error INTEGER NOT NULL, '
+                             'used INTEGER NOT NULL, PRIMARY KEY (result, local_rules, version)) WITHOUT ROWID')
+            self._db.execute('DELETE FROM scores WHERE version != ?', (be.ENGINE_VERSION,))
+            # every run gets its number, rows remember the last run that used them
+            self._run = self._db.execute('PRAGMA user_version').fetchone()[0] + 1
+            self._db.execute(f'PRAGMA user_version = {self._run}')
+        self._size = self._db.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._size + len(self._new)
+
+    def __contains__(self, key):
+        result, local_rules = key
+        return key in self._new or result in self._items(local_rules)
+
+    def _items(self, local_rules):
+        """ Cached results of the rule set: result -> (points, error code, last run)"""
+        items = self._loaded.get(local_rules)
+        if items is None:
+            rows = self._db.execute('SELECT result, points, error, used FROM scores WHERE local_rules = ? '
+                                    'AND version = ?', (int(local_rules), be.ENGINE_VERSION))
+            items = self._loaded[local_rules] = {result: (points, error, used) for result, points, error, used in rows}
+        return items
+
+    def score(self, result, local_rules=True):
+        """
+        Get game points from the cache or count them
+        :param result: bowling game result
+        :param local_rules: counting result rules: local(True) or tournament(False)
+        :return: tuple (points, error code)
+        """
+        items = self._loaded.get(local_rules)
+        if items is None:
+            items = self._items(local_rules)
+        value = items.get(result)
+        if value is None:
+            key = (result, local_rules)
+            value = self._new.get(key)
+            if value is None:
+                self.misses += 1
+                value = self._new[key] = self.scorer(result, local_rules)
+                if len(self._new) >= self.batch_size:
+                    self.flush()
+            else:
+                self.hits += 1
+            return value
+        self.hits += 1
+        points, error, used = value
+        if used != self._run:
+            items[result] = (points, error, self._run)
+            self._touched.append((self._run, result, int(local_rules), be.ENGINE_VERSION))
+        return points, error
+
+    def flush(self):
+        """ Write new results and last use of cached ones to the file, drop least recently used rows"""
+        if not self._new and not self._touched:
+            return
+        with self._db:
+            inserted = self._db.executemany(
+                'INSERT OR IGNORE INTO scores VALUES (?, ?, ?, ?, ?, ?)',
+                ((result, int(local_rules), be.ENGINE_VERSION, points, error, self._run)
+                 for (result, local_rules), (points, error) in self._new.items())).rowcount
+            self._db.executemany('UPDATE scores SET used = ? WHERE result = ? AND local_rules = ? AND version = ?',
+                                 self._touched)
+            self._size += max(inserted, 0)
+            if self._size > self.max_size:
+                excess = self._size - self.max_size
+                self._db.execute('DELETE FROM scores WHERE (result, local_rules, version) IN (SELECT result, '
+                                 'local_rules, version FROM scores ORDER BY used LIMIT ?)', (excess,))
+                self._size -= excess
+                self.evictions += excess
+        for (result, local_rules), (points, error) in self._new.items():
+            items = self._loaded.get(local_rules)
+            if items is not None and len(items) < self.max_size:
+                items[result] = (points, error, self._run)
+        self._new.clear()
+        self._touched.clear()
+
+    def clear(self):
+        """ Drop cached results from memory and from the file, counters stay as they are"""
+        with self._db:
+            self._db.execute('DELETE FROM scores')
+        self._size = 0
+        self._loaded.clear()
+        self._new.clear()
+        self._touched.clear()
+
+    def close(self):
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def stats(self):
+        return {'size': len(self), 'max_size': self.max_size, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
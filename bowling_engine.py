@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+"""
+Table-driven scoring engine for bowling game results.
+Both rule sets (local and tournament) are compiled into transition tables once at import time,
+so a game string is scored in one loop over integers without creating state objects.
+Results are the same as bowling.Bowling.total_result gives after check_result(),
+games that break the rules get 0 points and an error code.
+With local rules points of a frame depend only on its own throws, so every correct frame is precomputed
+in LOCAL_FRAMES too and a game can be scored frame by frame.
+Scorecards (cumulative points after every frame) are written into buffers given by the caller,
+tournament bonuses are sent back to their frames with a split table kept next to the rule table.
+Tables are tuples and scoring functions keep nothing between calls, so they are re-entrant
+and one engine is shared by any amount of threads.
+"""
+import re
+from array import array
+from collections import namedtuple
+
+# version of scoring results, caches made by other versions are not used
+ENGINE_VERSION = 1
+
+ERR_OK = 0
+ERR_BAD_SYMBOL = 1
+ERR_WRONG_LENGTH = 2
+ERR_FRAME_OVERFLOW = 3
+ERR_MISPLACED_SPARE = 4
+ERR_MISPLACED_STRIKE = 5
+ERR_WRONG_FRAME_COUNT = 6
+
+ERROR_MESSAGES = {
+    ERR_OK: 'OK',
+    ERR_BAD_SYMBOL: 'Symbol is not available',
+    ERR_WRONG_LENGTH: 'Incorrect amount of symbols, expected from 10 to 20',
+    ERR_FRAME_OVERFLOW: "Frame result can't be more than 10 if it is not strike/spare",
+    ERR_MISPLACED_SPARE: "First throw can't be spare",
+    ERR_MISPLACED_STRIKE: "Second throw can't be strike",
+    ERR_WRONG_FRAME_COUNT: 'The game should have 10 frames',
+}
+
+ValidationResult = namedtuple('ValidationResult', 'error position')
+VALID = ValidationResult(ERR_OK, None)
+
+FRAMES = 10
+MIN_SYMBOLS = 10
+MAX_SYMBOLS = 20
+
+STRIKE = 10
+SPARE = 11
+_WIDTH = 12  # amount of symbol codes: pins 0-9, strike, spare
+
+# byte -> symbol code, used with bytes.translate()
+CODE_MAP = bytearray(256)
+for _pins in range(1, 10):
+    CODE_MAP[ord(str(_pins))] = _pins
+CODE_MAP[ord('-')] = 0
+CODE_MAP[ord('X')] = STRIKE
+CODE_MAP[ord('x')] = STRIKE
+CODE_MAP[ord('/')] = SPARE
+CODE_MAP = bytes(CODE_MAP)
+VALID_BYTES = b'123456789-Xx/'
+VALID_SYMBOLS = frozenset(VALID_BYTES.decode())
+
+
+def _error(code):
+    """ Table cell for a throw that breaks the game rules"""
+    return -code, 0, 0, 0
+
+
+def _build_local_table():
+    """
+    Local rules states: 0 - first throw, 1 + p - second throw after p pins on the first one.
+    Each cell is (next state offset, points to total, bonus points, frames started).
+    """
+    table = [None] * (11 * _WIDTH)
+    for code in range(10):
+        table[code] = ((1 + code) * _WIDTH, 0, 0, 1)
+    table[STRIKE] = (0, 20, 0, 1)
+    table[SPARE] = _error(ERR_MISPLACED_SPARE)
+    for first in range(10):
+        offset = (1 + first) * _WIDTH
+        for code in range(10):
+            if first + code > 10:
+                table[offset + code] = _error(ERR_FRAME_OVERFLOW)
+            else:
+                table[offset + code] = (0, first + code, 0, 0)
+        table[offset + STRIKE] = _error(ERR_MISPLACED_STRIKE)
+        table[offset + SPARE] = (0, 15, 0, 0)
+    return tuple(table), (0,) * 11
+
+
+_AFTER_STRIKE_FIRST = 1
+_AFTER_STRIKE_SECOND = 2
+_AFTER_SPARE = 4
+
+
+def _pending(flags):
+    """ How many bonuses are waiting for the next throw"""
+    return (bool(flags & _AFTER_STRIKE_FIRST) + bool(flags & _AFTER_STRIKE_SECOND)
+            + bool(flags & _AFTER_SPARE))
+
+
+def _build_champ_table():
+    """
+    Tournament rules states: 0-7 - first throw with pending bonus flags
+    (after_strike_first, after_strike_second, after_spare),
+    8 + 2 * p + b - second throw after p pins, b is after_strike_second flag.
+    """
+    table = [None] * (28 * _WIDTH)
+    final_bonus = [0] * 28
+    for flags in range(8):
+        offset = flags * _WIDTH
+        pending = _pending(flags)
+        strike_first = flags & _AFTER_STRIKE_FIRST
+        for code in range(10):
+            table[offset + code] = ((8 + 2 * code + bool(strike_first)) * _WIDTH, 0, code * pending, 1)
+        next_flags = _AFTER_STRIKE_FIRST | (_AFTER_STRIKE_SECOND if strike_first else 0)
+        table[offset + STRIKE] = (next_flags * _WIDTH, 10, 10 * pending, 1)
+        table[offset + SPARE] = _error(ERR_MISPLACED_SPARE)
+        final_bonus[flags] = 10 * pending
+    for first in range(10):
+        for strike_second in (0, 1):
+            state = 8 + 2 * first + strike_second
+            offset = state * _WIDTH
+            for code in range(10):
+                table[offset + code] = (0, first + code, code * strike_second, 0)
+            table[offset + STRIKE] = _error(ERR_MISPLACED_STRIKE)
+            table[offset + SPARE] = (_AFTER_SPARE * _WIDTH, 10, (10 - first) * strike_second, 0)
+            final_bonus[state] = 10 * strike_second
+    return tuple(table), tuple(final_bonus)
+
+
+def _build_champ_split():
+    """
+    Frames that get bonus points of _CHAMP_TABLE cells: split[state + code] is
+    (points to the frame before the throw's frame, points to the frame before that one),
+    final_split[state] is (points to the last frame, points to the frame before it) added when the game ends.
+    """
+    split = [(0, 0)] * (28 * _WIDTH)
+    final_split = [(0, 0)] * 28
+    for flags in range(8):
+        offset = flags * _WIDTH
+        previous = bool(flags & _AFTER_STRIKE_FIRST) + bool(flags & _AFTER_SPARE)
+        before = bool(flags & _AFTER_STRIKE_SECOND)
+        for code in range(10):
+            split[offset + code] = (code * previous, code * before)
+        split[offset + STRIKE] = (10 * previous, 10 * before)
+        final_split[flags] = (10 * previous, 10 * before)
+    for first in range(10):
+        for strike_second in (0, 1):
+            state = 8 + 2 * first + strike_second
+            offset = state * _WIDTH
+            for code in range(10):
+                split[offset + code] = (code * strike_second, 0)
+            split[offset + SPARE] = ((10 - first) * strike_second, 0)
+            # the game ended after the first throw of the last frame, the strike before it waits for one more throw
+            final_split[state] = (0, 10 * strike_second)
+    return tuple(split), tuple(final_split)
+
+
+def _build_card_table(table, split=None):
+    """
+    Rule table for scorecards: cell is (next state or -error code, points to the frame of the throw,
+    frames started, bonus to the previous frame, bonus to the frame before it)
+    :param split: bonus split of table cells, None if the rules have no bonuses
+    """
+    return tuple((state, points, frame) + (split[cell] if split else (0, 0))
+                 for cell, (state, points, _, frame) in enumerate(table))
+
+
+_LOCAL_TABLE, _LOCAL_FINAL_BONUS = _build_local_table()
+_CHAMP_TABLE, _CHAMP_FINAL_BONUS = _build_champ_table()
+_CHAMP_SPLIT, _CHAMP_FINAL_SPLIT = _build_champ_split()
+_LOCAL_FINAL_SPLIT = ((0, 0),) * len(_LOCAL_FINAL_BONUS)
+_LOCAL_CARD_TABLE = _build_card_table(_LOCAL_TABLE)
+_CHAMP_CARD_TABLE = _build_card_table(_CHAMP_TABLE, _CHAMP_SPLIT)
+
+# frame of a game: strike or up to two throws
+_FRAME_TOKEN = re.compile(rb'[Xx]|..?', re.DOTALL)
+
+
+def _build_local_frames():
+    """
+    Every correct frame of local rules -> its points, found by running all one and two symbol frames
+    through the local table. One regular throw is a frame only at the end of the game and gives no points.
+    """
+    frames = {}
+    for first in VALID_BYTES:
+        for token in [bytes([first])] + [bytes([first, second]) for second in VALID_BYTES]:
+            state = total = started = 0
+            for code in token.translate(CODE_MAP):
+                state, points, _, frame = _LOCAL_TABLE[state + code]
+                if state < 0:
+                    break
+                total += points
+                started += frame
+            if state >= 0 and started == 1 and (state == 0 or len(token) == 1):
+                frames[token] = total
+    return frames
+
+
+LOCAL_FRAMES = _build_local_frames()
+
+
+def rule_table(local_rules=True):
+    """
+    Transition table of the rule set: table[state + code] is
+    (next state or -error code, points to total, bonus points, frames started), the first state is 0
+    """
+    return _LOCAL_TABLE if local_rules else _CHAMP_TABLE
+
+
+def validate(result, local_rules=True):
+    """
+    Check game result without counting points
+    :param result: bowling game result
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :return: ValidationResult (error code, index of the wrong throw or None), VALID for correct game
+    """
+    data = result.encode('utf-8')
+    if data.translate(None, VALID_BYTES):
+        for position, symbol in enumerate(result):
+            if symbol not in VALID_SYMBOLS:
+                return ValidationResult(ERR_BAD_SYMBOL, position)
+    if len(data) < MIN_SYMBOLS or len(data) > MAX_SYMBOLS:
+        return ValidationResult(ERR_WRONG_LENGTH, None)
+    table = _LOCAL_TABLE if local_rules else _CHAMP_TABLE
+    state = frames = 0
+    for position, code in enumerate(data.translate(CODE_MAP)):
+        state, _, _, frame = table[state + code]
+        if state < 0:
+            return ValidationResult(-state, position)
+        frames += frame
+    if frames != 10:
+        return ValidationResult(ERR_WRONG_FRAME_COUNT, None)
+    return VALID
+
+
+def error_message(error, position=None):
+    """ Text description of validation error"""
+    if position is None:
+        return ERROR_MESSAGES[error]
+    return f'{ERROR_MESSAGES[error]} (throw {position + 1})'
+
+
+def score_game(result, local_rules=True):
+    """
+    Count game points with precomputed tables
+    :param result: bowling game result
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :return: tuple (points, error code), incorrect game gets 0 points
+    """
+    data = result.encode('utf-8')
+    if data.translate(None, VALID_BYTES):
+        return 0, ERR_BAD_SYMBOL
+    if len(data) < MIN_SYMBOLS or len(data) > MAX_SYMBOLS:
+        return 0, ERR_WRONG_LENGTH
+    if local_rules:
+        table, final_bonus = _LOCAL_TABLE, _LOCAL_FINAL_BONUS
+    else:
+        table, final_bonus = _CHAMP_TABLE, _CHAMP_FINAL_BONUS
+    state = total = bonus = frames = 0
+    for code in data.translate(CODE_MAP):
+        state, points, extra, frame = table[state + code]
+        if state < 0:
+            return 0, -state
+        total += points
+        bonus += extra
+        frames += frame
+    if frames != 10:
+        return 0, ERR_WRONG_FRAME_COUNT
+    return total + bonus + final_bonus[state // _WIDTH], ERR_OK
+
+
+def frame_tokens(result):
+    """ Split game result into frames, e.g. '1/X3-' -> ['1/', 'X', '3-']"""
+    return [token.decode('utf-8', 'replace') for token in _FRAME_TOKEN.findall(result.encode('utf-8'))]
+
+
+def score_local_frames(result):
+    """
+    Points of each frame with local rules, every frame is one lookup in LOCAL_FRAMES
+    :param result: bowling game result
+    :return: tuple (list of frame points, error code), incorrect game gets empty list
+    """
+    data = result.encode('utf-8')
+    if MIN_SYMBOLS <= len(data) <= MAX_SYMBOLS:
+        tokens = _FRAME_TOKEN.findall(data)
+        if len(tokens) == 10:
+            try:
+                return [LOCAL_FRAMES[token] for token in tokens], ERR_OK
+            except KeyError:
+                pass
+    return [], validate(result).error
+
+
+def score(result, local_rules=True):
+    """ Count game points, incorrect game gets 0 points"""
+    return score_game(result, local_rules)[0]
+
+
+def score_many(results, local_rules=True):
+    """
+    Count points of many games in one call
+    :param results: iterable of bowling game results
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :return: tuple of arrays (points 'H', error codes 'B'), one item per game
+    """
+    if local_rules:
+        table, final_bonus = _LOCAL_TABLE, _LOCAL_FINAL_BONUS
+    else:
+        table, final_bonus = _CHAMP_TABLE, _CHAMP_FINAL_BONUS
+    # lists are appended to faster than arrays, they are turned into arrays once at the end
+    totals = []
+    errors = []
+    add_total = totals.append
+    add_error = errors.append
+    code_map = CODE_MAP
+    valid_bytes = VALID_BYTES
+    width = _WIDTH
+    for result in results:
+        data = result.encode('utf-8')
+        if data.translate(None, valid_bytes):
+            add_total(0)
+            add_error(ERR_BAD_SYMBOL)
+            continue
+        if len(data) < MIN_SYMBOLS or len(data) > MAX_SYMBOLS:
+            add_total(0)
+            add_error(ERR_WRONG_LENGTH)
+            continue
+        state = total = bonus = frames = 0
+        for code in data.translate(code_map):
+            state, points, extra, frame = table[state + code]
+            if state < 0:
+                break
+            total += points
+            bonus += extra
+            frames += frame
+        if state < 0:
+            add_total(0)
+            add_error(-state)
+        elif frames != 10:
+            add_total(0)
+            add_error(ERR_WRONG_FRAME_COUNT)
+        else:
+            add_total(total + bonus + final_bonus[state // width])
+            add_error(ERR_OK)
+    return array('H', totals), array('B', errors)
+
+
+def fill_scorecard(result, card, local_rules=True, offset=0):
+    """
+    Count cumulative points after every frame into a buffer.
+    Frame points are collected in a scratch list of this call first and card is written only when the whole game
+    is correct, so errors are found in the same order as score_game finds them
+    :param result: bowling game result
+    :param card: writable buffer of integers, e.g. array('H') or memoryview cast to 'H',
+        card[offset:offset + FRAMES] is filled, the last item is the same as score_game gives
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :param offset: index of the first frame in card
+    :return: error code, incorrect game gets zeros in all its frames
+    """
+    data = result.encode('utf-8')
+    if data.translate(None, VALID_BYTES):
+        error = ERR_BAD_SYMBOL
+    elif len(data) < MIN_SYMBOLS or len(data) > MAX_SYMBOLS:
+        error = ERR_WRONG_LENGTH
+    elif local_rules:
+        error = _fill_card(data, card, offset, _LOCAL_CARD_TABLE, _LOCAL_FINAL_SPLIT)
+    else:
+        error = _fill_card(data, card, offset, _CHAMP_CARD_TABLE, _CHAMP_FINAL_SPLIT)
+    if error:
+        for index in range(offset, offset + FRAMES):
+            card[index] = 0
+    return error
+
+
+def _fill_card(data, card, offset, table, final_split):
+    """ Points of every frame in one pass over throws into a scratch list, then their running total goes to card"""
+    # frames past the tenth are counted too, the game is rejected after the loop as score_game does
+    scores = [0] * MAX_SYMBOLS
+    state = 0
+    frame_index = -1
+    for code in data.translate(CODE_MAP):
+        state, points, frame, previous, before = table[state + code]
+        if state < 0:
+            return -state
+        frame_index += frame
+        scores[frame_index] += points
+        if previous:
+            scores[frame_index - 1] += previous
+        if before:
+            scores[frame_index - 2] += before
+    if frame_index != FRAMES - 1:
+        return ERR_WRONG_FRAME_COUNT
+    last, before_last = final_split[state // _WIDTH]
+    scores[frame_index] += last
+    scores[frame_index - 1] += before_last
+    total = 0
+    for index in range(FRAMES):
+        total += scores[index]
+        card[offset + index] = total
+    return ERR_OK
+
+
+def scorecard(result, local_rules=True):
+    """
+    Cumulative points after every frame
+    :return: tuple (array 'H' of FRAMES items, error code), incorrect game gets zeros
+    """
+    card = array('H', bytes(2 * FRAMES))
+    return card, fill_scorecard(result, card, local_rules)
+
+
+def scorecards(results, local_rules=True, cards=None):
+    """
+    Scorecards of many games in one contiguous buffer, card of game i is cards[i * FRAMES:(i + 1) * FRAMES]
+    :param results: bowling game results, an iterator is read into a list first to know the size
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :param cards: optional writable buffer of at least len(results) * FRAMES integers, it is filled and returned,
+        by default a new array('H') is made
+    :return: tuple (cards, array 'B' of error codes), see card_view for one card without copying
+    """
+    if not hasattr(results, '__len__'):
+        results = list(results)
+    if cards is None:
+        cards = array('H', bytes(2 * FRAMES * len(results)))
+    elif len(cards) < FRAMES * len(results):
+        raise ValueError(f'Buffer of {len(cards)} items is too small for {len(results)} scorecards')
+    errors = array('B', bytes(len(results)))
+    for index, result in enumerate(results):
+        errors[index] = fill_scorecard(result, cards, local_rules, index * FRAMES)
+    return cards, errors
+
+
+def card_view(cards, index):
+    """ Scorecard of game index from scorecards() buffer as memoryview, nothing is copied"""
+    return memoryview(cards)[index * FRAMES:(index + 1) * FRAMES]
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Live scoring of a game in progress: throws are added one by one as they happen on the lane.
+Every throw is one lookup in the bowling_engine transition table, so nothing is rescored.
+"""
+from array import array
+
+import bowling_engine as be
+
+
+class LiveGame:
+    """
+    Bowling game that gets throws one at a time and keeps running total and points of each frame.
+    Points are counted by the same rules as bowling.Bowling, throws that break the rules are not accepted.
+    """
+    __slots__ = ('local_rules', 'throws', 'total', 'frames', 'frame_scores', '_state', '_first_pins', '_pending')
+
+    def __init__(self, local_rules=True):
+        """
+        :param local_rules: counting result rules: local(True) or tournament(False)
+        """
+        self.local_rules = local_rules
+        self.throws = ''
+        self.total = 0
+        self.frames = 0
+        self.frame_scores = array('H', bytes(20))
+        self._state = 0
+        self._first_pins = None
+        # [frame index, throws left] of strikes and spares waiting for bonus, tournament rules only
+        self._pending = []
+
+    def add_throw(self, symbol):
+        """
+        Add next throw of the game
+        :param symbol: one symbol of game result: 1-9, '-', 'X', 'x' or '/'
+        :return: error code, bowling_engine.ERR_OK if throw is accepted
+        """
+        if len(symbol) != 1 or symbol not in be.VALID_SYMBOLS:
+            return be.ERR_BAD_SYMBOL
+        if len(self.throws) == be.MAX_SYMBOLS:
+            return be.ERR_WRONG_LENGTH
+        code = be.CODE_MAP[ord(symbol)]
+        state, points, extra, frame = be.rule_table(self.local_rules)[self._state + code]
+        if state < 0:
+            return -state
+        if frame and self.frames == 10:
+            return be.ERR_WRONG_FRAME_COUNT
+
+        self._state = state
+        self.frames += frame
+        self.throws += symbol
+        self.total += points + extra
+        if self._pending:
+            if code == be.STRIKE:
+                value = 10
+            elif code == be.SPARE:
+                value = 10 - self._first_pins
+            else:
+                value = code
+            for entry in self._pending:
+                self.frame_scores[entry[0]] += value
+                entry[1] -= 1
+            if self._pending[0][1] == 0:
+                del self._pending[0]
+        frame_index = self.frames - 1
+        self.frame_scores[frame_index] += points
+        if code == be.STRIKE:
+            self._first_pins = None
+            if not self.local_rules:
+                self._pending.append([frame_index, 2])
+        elif code == be.SPARE:
+            self._first_pins = None
+            if not self.local_rules:
+                self._pending.append([frame_index, 1])
+        elif frame:
+            self._first_pins = code
+        else:
+            self._first_pins = None
+        return be.ERR_OK
+
+    @property
+    def frame(self):
+        """ Number of the frame that is played now, from 1 to 10"""
+        if self._first_pins is not None or self.frames == 10:
+            return self.frames
+        return self.frames + 1
+
+    @property
+    def throw_in_frame(self):
+        """ Which throw of the current frame is next: 1 or 2"""
+        return 1 if self._first_pins is None else 2
+
+    @property
+    def is_finished(self):
+        """ All 10 frames are played"""
+        return self.frames == 10 and self._first_pins is None
+
+    @property
+    def pending_bonuses(self):
+        """ Frames waiting for bonus points: list of (frame number, throws left)"""
+        return [(frame_index + 1, throws_left) for frame_index, throws_left in self._pending]
+
+    def frame_points(self, final=False):
+        """
+        Points of each frame
+        :param final: add 10 points to every frame still waiting for bonus, as it is done when game ends
+        """
+        points = self.frame_scores.tolist()[:max(self.frames, 1)]
+        if final:
+            for frame_index, _ in self._pending:
+                points[frame_index] += 10
+        return points
+
+    def result(self):
+        """
+        Points of the game if it ends now, the same as bowling_engine.score_game gives for throws
+        :return: tuple (points, error code)
+        """
+        if len(self.throws) < be.MIN_SYMBOLS:
+            return 0, be.ERR_WRONG_LENGTH
+        if self.frames != 10:
+            return 0, be.ERR_WRONG_FRAME_COUNT
+        return self.total + 10 * len(self._pending), be.ERR_OK
+
+    def to_dict(self):
+        return {'throws': self.throws, 'local_rules': self.local_rules}
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Restore the game saved with to_dict()"""
+        game = cls(local_rules=data['local_rules'])
+        for symbol in data['throws']:
+            error = game.add_throw(symbol)
+            if error:
+                raise ValueError(f'Saved game has incorrect throw {symbol}: {be.error_message(error)}')
+        return game
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        game = self.from_dict(state)
+        for name in self.__slots__:
+            setattr(self, name, getattr(game, name))
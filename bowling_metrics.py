@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Optional instrumentation of scoring and tournament processing: stage timers and counters.
+Nothing is measured until enable() is called, instrumented code only checks that ACTIVE is None.
+"""
+import sys
+import time
+from collections import defaultdict
+
+ACTIVE = None
+
+
+class Metrics:
+    """
+    Collector of stage timers (seconds) and counters.
+    Exporters are functions that get snapshot() dict when export() is called.
+    """
+
+    def __init__(self, exporters=()):
+        self.timers = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.exporters = list(exporters)
+        self._stack = []
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def add_time(self, name, seconds):
+        self.timers[name] += seconds
+
+    def count_game(self, result, error):
+        """ Counters of one scored game: games, errors, strikes, spares"""
+        self.counters['games'] += 1
+        if error:
+            self.counters['errors'] += 1
+        self.counters['strikes'] += result.count('X') + result.count('x')
+        self.counters['spares'] += result.count('/')
+
+    def timed(self, name, iterable):
+        """
+        Iterate over a pipeline stage and count time spent in it,
+        time of inner stages that are timed too is not counted twice
+        """
+        iterator = iter(iterable)
+        stack = self._stack
+        clock = time.perf_counter
+        while True:
+            stack.append(0.0)
+            started = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = clock() - started
+                self.timers[name] += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+            yield item
+
+    def snapshot(self):
+        return {'timers': dict(self.timers), 'counters': dict(self.counters)}
+
+    def export(self):
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter(snapshot)
+
+
+def enable(exporters=()):
+    """
+    Start collecting metrics
+    :param exporters: functions that get metrics snapshot dict on export()
+    :return: active Metrics
+    """
+    global ACTIVE
+    ACTIVE = Metrics(exporters)
+    return ACTIVE
+
+
+def disable():
+    """ Stop collecting metrics, collected ones are exported"""
+    global ACTIVE
+    metrics, ACTIVE = ACTIVE, None
+    if metrics is not None:
+        metrics.export()
+    return metrics
+
+
+def text_exporter(stream=None):
+    """ Exporter that prints timers and counters as a table, to stderr by default"""
+    def export(snapshot):
+        out = stream or sys.stderr
+        out.write(f'+{"-" * 20}+{"-" * 15}+\n')
+        for name, seconds in sorted(snapshot['timers'].items(), key=lambda i: i[1], reverse=True):
+            out.write(f'|{name:<20}|{seconds:>13.6f} s|\n')
+        out.write(f'+{"-" * 20}+{"-" * 15}+\n')
+        for name, value in sorted(snapshot['counters'].items()):
+            out.write(f'|{name:<20}|{value:>15}|\n')
+        out.write(f'+{"-" * 20}+{"-" * 15}+\n')
+    return export
+
+
+def json_exporter(path):
+    """ Exporter that writes snapshot to JSON file"""
+    import json
+
+    def export(snapshot):
+        with open(path, 'w', encoding='UTF8') as file:
+            json.dump(snapshot, file, indent=2)
+    return export
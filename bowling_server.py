@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Scoring service on a local TCP socket. The engine stays loaded between requests,
+so scoring a game or a tournament doesn't pay interpreter startup every time.
+
+Protocol is line based. Requests of one connection may be sent without waiting for answers,
+they are answered in the same order:
+    GAME <result> [local|tournament]    ->  OK <points>  or  ERROR <code> <message>
+    TOUR [local|tournament]             ->  report lines, the same as BowlingTournament writes, then END
+    <lines in tournament.txt format>        incorrect results are answered with REJECT <name> <result> <message>
+    END                                     between report lines
+Rules are the server ones if they are not given in the request.
+A line that is not UTF-8 or a player line without result is answered with ERROR 0 <message>, the connection
+is served further.
+"""
+import argparse
+import asyncio
+
+import bowling_engine as be
+import tournament_pipeline as tp
+
+RULES = {'local': True, 'tournament': False}
+END = 'END'
+REJECT = 'REJECT'
+# how long requests after a too long line are read and dropped before the connection is closed
+DISCARD_TIMEOUT = 1.0
+
+
+class BadLine(Exception):
+    """ Request line that can't be read, it is answered with an error and skipped"""
+
+
+class RejectLines:
+    """ Sink for tournament_pipeline.Rejects that puts reject lines into an answer"""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def write(self, text):
+        self.lines.append(f'{REJECT} {text}')
+
+
+class ScoringServer:
+    """
+    Asyncio server that counts points of games and tournament blocks.
+    Answers are written with drain(), so a client that doesn't read them stops its own requests from being read.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, local_rules=True, score_cache=None, max_connections=64,
+                 max_line=4096):
+        """
+        :param host: address to listen on, only local one by default
+        :param port: port to listen on, 0 - any free port, see port after start()
+        :param local_rules: rules used when request doesn't choose them
+        :param score_cache: optional bowling_cache.ScoreCache shared by all connections
+        :param max_connections: connections that are served at once, others wait
+        :param max_line: longest request line in bytes
+        """
+        self.host = host
+        self.port = port
+        self.local_rules = local_rules
+        self.score_cache = score_cache
+        self.max_line = max_line
+        self.requests = 0
+        self._slots = asyncio.Semaphore(max_connections)
+        self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle, self.host, self.port, limit=self.max_line)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _scorer(self):
+        if self.score_cache is not None:
+            return self.score_cache.score
+        return be.score_game
+
+    def _rules(self, words):
+        """ Rules chosen by the request, None if they are unknown"""
+        if not words:
+            return self.local_rules
+        return RULES.get(words[0].lower())
+
+    async def handle(self, reader, writer):
+        """ Serve requests of one connection until it is closed"""
+        async with self._slots:
+            try:
+                while True:
+                    try:
+                        line = await self._readline(reader, writer)
+                    except BadLine as exc:
+                        self.requests += 1
+                        writer.write(f'ERROR 0 {exc}\n'.encode('UTF8'))
+                        await writer.drain()
+                        continue
+                    if line is None:
+                        break
+                    words = line.split()
+                    if not words:
+                        continue
+                    self.requests += 1
+                    command = words[0].upper()
+                    if command == 'GAME' and len(words) in (2, 3):
+                        writer.write(self.game_answer(words[1], self._rules(words[2:])).encode('UTF8'))
+                    elif command == 'TOUR' and len(words) <= 2:
+                        await self.tour_answer(reader, writer, self._rules(words[1:]))
+                    else:
+                        writer.write(f'ERROR 0 unknown request {line}\n'.encode('UTF8'))
+                    await writer.drain()
+            except (ConnectionError, ValueError):
+                pass
+            finally:
+                writer.close()
+
+    async def _readline(self, reader, writer):
+        """
+        Next line without line end, None when connection is closed, BadLine if it is not UTF-8.
+        A line longer than max_line is answered with an error and ValueError is raised, the connection is closed then:
+        the rest of that line can't be told from the next requests.
+        """
+        try:
+            line = await reader.readline()
+        except ValueError:
+            writer.write(b'ERROR 0 request line too long\n')
+            await writer.drain()
+            writer.write_eof()
+            try:
+                # unread requests would make closing socket reset the connection and lose the answer
+                await asyncio.wait_for(self._discard(reader), DISCARD_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            raise
+        if not line:
+            return None
+        try:
+            return line.decode('UTF8').rstrip('\r\n')
+        except UnicodeDecodeError:
+            raise BadLine('request line is not UTF-8') from None
+
+    @staticmethod
+    async def _discard(reader):
+        while await reader.read(65536):
+            pass
+
+    def game_answer(self, result, local_rules):
+        """ Answer line for one game result"""
+        if local_rules is None:
+            return 'ERROR 0 unknown rules\n'
+        points, error = self._scorer()(result, local_rules)
+        if error:
+            error, position = be.validate(result, local_rules=local_rules)
+            return f'ERROR {error} {be.error_message(error, position)}\n'
+        return f'OK {points}\n'
+
+    async def tour_answer(self, reader, writer, local_rules):
+        """
+        Read tournament lines up to END and answer with report lines.
+        Every tour is scored as soon as its winner line comes, so only one tour is kept in memory.
+        """
+        standings = tp.Standings()
+        answer = []
+        rejects = tp.Rejects(RejectLines(answer), local_rules=bool(local_rules))
+        scorer = self._scorer()
+        block = []
+        while True:
+            try:
+                line = await self._readline(reader, writer)
+            except BadLine as exc:
+                writer.write(f'ERROR 0 {exc}\n'.encode('UTF8'))
+                continue
+            if line is None or line == END:
+                break
+            if len(line.split()) == 1 and not line.startswith(('### Tour', 'winner')):
+                writer.write(f'ERROR 0 player line without result {line}\n'.encode('UTF8'))
+                continue
+            block.append(line)
+            if line.startswith('winner') and local_rules is not None:
+                self._write_rows(writer, tp.process(block, standings, local_rules=local_rules, scorer=scorer,
+                                                    tour_counter=standings.tours, rejects=rejects), answer)
+                block.clear()
+                await writer.drain()
+        if local_rules is None:
+            writer.write(b'ERROR 0 unknown rules\n')
+            return
+        self._write_rows(writer, tp.process(block, standings, local_rules=local_rules, scorer=scorer,
+                                            tour_counter=standings.tours, rejects=rejects), answer)
+        writer.write(f'{END}\n'.encode('UTF8'))
+
+    @staticmethod
+    def _write_rows(writer, rows, answer):
+        """ Write report lines with reject lines that came between them"""
+        for row in rows:
+            answer.append(row)
+        writer.write(''.join(answer).encode('UTF8'))
+        answer.clear()
+
+
+async def request(host, port, lines):
+    """
+    Send request lines over one connection and read all answer lines, used by clients and tests
+    :param lines: request lines without line ends, several requests can be sent at once
+    :return: list of answer lines
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(''.join(f'{line}\n' for line in lines).encode('UTF8'))
+        await writer.drain()
+        writer.write_eof()
+        answer = await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return answer.decode('UTF8').splitlines()
+
+
+async def serve(host='127.0.0.1', port=8765, local_rules=True):
+    server = ScoringServer(host, port, local_rules=local_rules)
+    await server.start()
+    print(f'Scoring server is listening on {server.host}:{server.port}')
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+    server_parser = argparse.ArgumentParser('Local scoring server for bowling games and tournament blocks')
+    server_parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    server_parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    server_parser.add_argument('--tournament_rules', action='store_true',
+                               help='Count results with tournament rules by default')
+    server_args = server_parser.parse_args()
+    asyncio.run(serve(server_args.host, server_args.port, local_rules=not server_args.tournament_rules))
+
+# input example
+# python3 bowling_server.py --port 8765
+# printf 'GAME 1/X3-5/X8154-57/X\nGAME 1/X3-5/X8154-57/X tournament\n' | nc -q 1 127.0.0.1 8765
@@ -1,6 +1,63 @@
 # -*- coding: utf-8 -*-
 import os
-import bowling as bw
+import time
+
+import bowling_engine as be
+import bowling_metrics as bm
+import tournament_pipeline as tp
+# tournament_binary, tournament_incremental, tournament_reader, tournament_stats and tournament_table are imported
+# only by the modes that use them,
+# so console script starts without them
+
+
+class ReportWriter:
+    """
+    Class keeps report file open during the whole run and writes lines in batches.
+    """
+
+    def __init__(self, output_file, flush_size=1000):
+        """
+        :param output_file: file where to write down results, new lines are appended
+        :param flush_size: how many lines are kept in memory before writing them to the file
+        """
+        self.output_file = output_file
+        self.flush_size = flush_size
+        self._buffer = []
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self):
+        self._file = open(self.output_file, 'a', encoding='UTF8')
+
+    def write(self, line):
+        self._buffer.append(line)
+        if len(self._buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            metrics = bm.ACTIVE
+            if metrics is not None:
+                started = time.perf_counter()
+            text = ''.join(self._buffer)
+            self._file.write(text)
+            self._file.flush()
+            self._buffer.clear()
+            if metrics is not None:
+                metrics.add_time('write', time.perf_counter() - started)
+                metrics.count('bytes_written', len(text.encode('UTF8')))
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
 
 
 class BowlingTournament:
@@ -9,94 +66,216 @@ class BowlingTournament:
     Class returns file contains player name, game result, game points and also can make tournament table.
     """
 
-    def __init__(self, input_file, output_file='tournament_result.txt', make_table=False, local_rules=True):
+    def __init__(self, input_file, output_file='tournament_result.txt', make_table=False, local_rules=True,
+                 score_cache=None, flush_size=1000, workers=1, memory_map=False, reject_file=None, incremental=False,
+                 binary_file=None, threads=1, collect_stats=False, use_bowling=False, overwrite=False):
         """
         :param input_file: file with game results
         :param output_file: file where to write down results
         :param make_table: optional param, if it needs to write down tournament table in console
         :param local_rules: which rules use for counting results
+        :param score_cache: optional bowling_cache.ScoreCache or DiskScoreCache, repeated game results are not counted
+            again, it can't be used with workers or threads
+        :param flush_size: how many report lines are collected before writing them to output_file
+        :param workers: amount of processes for scoring tours, 1 - everything is done in this process
+        :param memory_map: read input_file through mmap, for files that are too big to be read as text
+        :param reject_file: optional file where incorrect results are written, they are not put into the report
+        :param incremental: keep a manifest next to output_file and score again only tours that changed since
+            the last run, output_file and reject_file are rewritten instead of appended to
+        :param binary_file: optional file where scored results are also written in columnar binary format,
+            see tournament_binary
+        :param threads: amount of threads for scoring tours when workers are not used, file is read and report
+            is written by this thread meanwhile. Tours are scored with bowling_engine.score_game, it is shared
+            by all threads
+        :param collect_stats: collect strike and spare rates, averages and score distribution into stats,
+            see tournament_stats
+        :param use_bowling: count points with bowling.Bowling instead of bowling_engine, it is much slower
+            and is kept for checking the engine
+        :param overwrite: output_file and reject_file are replaced when the run is over instead of appended to,
+            old content stays until the new one is written
         """
+        if score_cache is not None and (workers > 1 or threads > 1):
+            raise ValueError('Score cache can be used only when tours are scored in this thread')
         self.input_file = os.path.normpath(input_file)
         self.output_file = os.path.normpath(output_file)
         self.make_table = make_table
-        self.tournament_results = {}
-        self.player_played = {}
-        self.player_winner = {}
+        self.standings = tp.Standings()
+        self.tournament_results = self.standings.tour_results
+        self.player_played = self.standings.player_played
+        self.player_winner = self.standings.player_winner
         self.tour_counter = 0
         self.game_played = 0
         self.local_rules = local_rules
+        self.score_cache = score_cache
+        self.flush_size = flush_size
+        self.workers = workers
+        self.threads = threads
+        self.memory_map = memory_map
+        self.reject_file = os.path.normpath(reject_file) if reject_file else None
+        self.rejects = tp.Rejects(local_rules=local_rules)
+        self.incremental = incremental
+        self.scored_tours = None
+        self.binary_file = os.path.normpath(binary_file) if binary_file else None
+        self._binary = None
+        self.collect_stats = collect_stats
+        self.stats = None
+        self.use_bowling = use_bowling
+        self.overwrite = overwrite
 
     def analyze_input_file(self):
         """ Analyzing input_file"""
+        if self.collect_stats:
+            import tournament_stats as ts
+            self.stats = ts.TournamentStats()
+        if self.incremental:
+            self.analyze_incremental()
+        else:
+            self._analyze_full()
+        if self.make_table:
+            self.tournament_table()
+
+    def _analyze_full(self):
+        if not self.overwrite:
+            self._write_report(self.output_file, self.reject_file)
+            return
+        output_file = self._temporary(self.output_file)
+        reject_file = self._temporary(self.reject_file) if self.reject_file else None
+        try:
+            self._write_report(output_file, reject_file)
+        except BaseException:
+            for path in (output_file, reject_file):
+                if path and os.path.exists(path):
+                    os.remove(path)
+            raise
+        os.replace(output_file, self.output_file)
+        if reject_file:
+            os.replace(reject_file, self.reject_file)
+
+    def _write_report(self, output_file, reject_file):
+        with ReportWriter(output_file, flush_size=self.flush_size) as report:
+            if reject_file:
+                self.rejects.sink = ReportWriter(reject_file, flush_size=self.flush_size)
+                self.rejects.sink.open()
+            if self.binary_file:
+                import tournament_binary as tb
+                self._binary = tb.BinaryWriter(self.binary_file)
+            try:
+                if self.memory_map:
+                    tp.write_rows(self.process_mapped(), report)
+                else:
+                    with open(self.input_file, mode='r', encoding='UTF8') as file:
+                        tp.write_rows(self.process(file), report)
+                if self._binary is not None:
+                    self._binary.close()
+            finally:
+                self._binary = None
+                if self.rejects.sink is not None:
+                    self.rejects.sink.close()
+                    self.rejects.sink = None
+                if self.score_cache is not None:
+                    self.score_cache.flush()
+
+    def analyze_incremental(self):
+        """
+        Score only tours that changed since the last run and patch standings, see tournament_incremental.
+        Tours are scored in this thread, workers, threads and memory_map are not used.
+        """
+        import tournament_incremental as ti
+        manifest_file = ti.manifest_path(self.output_file)
+        manifest = ti.load_manifest(manifest_file, local_rules=self.local_rules)
+        if manifest is not None and not os.path.exists(self.output_file):
+            manifest = None
         with open(self.input_file, mode='r', encoding='UTF8') as file:
-            for line in file:
-                if line.startswith('### Tour'):
-                    self.tour_counter += 1
-                    with open(self.output_file, 'a', encoding='UTF8') as report_file:
-                        report_file.write(f'### Tour {self.tour_counter}\n')
-                    continue
-                if line.startswith('winner'):
-                    self._winner()
-                    continue
-                self._analyze_input_line(line=line)
-            if self.make_table:
-                self.tournament_table()
-
-    def _analyze_input_line(self, line):
-        """ Going through each line in file"""
-        line = line.rstrip()
-        if line:
-            line = line.split()
-            self.player_name = line[0]
-            self.player_result = line[1]
-            bwl = bw.Bowling(self.player_result, local_rules=self.local_rules)
-            bwl.check_result()
-            self.player_result_count = bwl.total_result
-            self.tournament_results[self.player_name] = []
-            self.tournament_results[self.player_name].append(self.player_result)
-            self.tournament_results[self.player_name].append(self.player_result_count)
-            self._tour_result()
-
-    def _tour_result(self):
-        with open(self.output_file, 'a', encoding='UTF8') as report_file:
-            report_file.write(f'{self.player_name} {self.tournament_results[self.player_name][0]}'
-                              f' {self.tournament_results[self.player_name][1]}\n')
-
-    def _winner(self):
-        """ Who is round winner"""
-        values_list = list(self.tournament_results.items())
-        values_list.sort(key=lambda i: i[1][1], reverse=True)
-        self.tournament_results = dict(values_list)
-        for item in self.tournament_results.items():
-            if item[0] in self.player_winner:
-                self.player_winner[item[0]] += 1
-            else:
-                self.player_winner[item[0]] = 1
-            break
-        for item in self.tournament_results.items():
-            if item[0] in self.player_winner:
-                self.player_winner[item[0]] += 0
-            else:
-                self.player_winner[item[0]] = 0
-            if item[0] in self.player_played:
-                self.player_played[item[0]] += 1
-            else:
-                self.player_played[item[0]] = 1
-        for item in self.tournament_results.items():
-            with open(self.output_file, 'a', encoding='UTF8') as report_file:
-                report_file.write(f'winner is {item[0]}\n')
-            break
-
-    def _tournament_table_making(self):
-        for item in self.player_played.items():
-            print(f'|{item[0]:^15}|{self.player_played[item[0]]:^20}|{self.player_winner[item[0]]:^20}|')
-
-    def tournament_table(self):
-        print(f'+{"-" * 15:^15}+{"-" * 20:^20}+{"-" * 20:^20}+')
-        print(f'|{"Player":^15}|{"Game played":^20}|{"Total victories":^20}|')
-        print(f'+{"-" * 15:^15}+{"-" * 20:^20}+{"-" * 20:^20}+')
-        self._tournament_table_making()
-        print(f'+{"-" * 15:^15}+{"-" * 20:^20}+{"-" * 20:^20}+')
+            tours, self.scored_tours = ti.update(tp.split_tours(file), manifest, self.standings,
+                                                 local_rules=self.local_rules, scorer=self._scorer())
+        if self.score_cache is not None:
+            self.score_cache.flush()
+        self._rewrite(self.output_file, ti.report_rows(tours))
+        if self.reject_file:
+            self._rewrite(self.reject_file, ti.reject_rows(tours))
+        if self.binary_file:
+            import tournament_binary as tb
+            with tb.BinaryWriter(self.binary_file) as binary:
+                for record in ti.records(tours):
+                    binary.add(record)
+        if self.stats is not None:
+            for record in ti.records(tours):
+                self.stats.add(record)
+        self.rejects.count = sum(len(entry['rejects']) for entry in tours)
+        ti.save_manifest(manifest_file, tours, self.standings, local_rules=self.local_rules)
+
+    def _rewrite(self, path, rows):
+        """ Replace file with new lines, old content stays until the new one is written"""
+        temporary = self._temporary(path)
+        with ReportWriter(temporary, flush_size=self.flush_size) as writer:
+            tp.write_rows(rows, writer)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _temporary(path):
+        """ Empty place next to path where its new content is written before replacing it"""
+        temporary = path + '.tmp'
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        return temporary
+
+    def process(self, lines):
+        """
+        Streaming pipeline over tournament file lines, standings of this tournament are updated
+        :param lines: iterable of lines in tournament.txt format
+        :return: generator of report lines
+        """
+        return tp.process(lines, self.standings, local_rules=self.local_rules, scorer=self._scorer(),
+                          tour_counter=self.tour_counter, workers=self.workers, rejects=self.rejects,
+                          stage=self._stage(), threads=self.threads)
+
+    def process_mapped(self):
+        """
+        Streaming pipeline over memory-mapped input_file, standings of this tournament are updated
+        :return: generator of report lines
+        """
+        import tournament_reader as tr
+        records = tr.mapped_records(self.input_file, local_rules=self.local_rules, scorer=self._scorer(),
+                                    tour_counter=self.tour_counter, workers=self.workers, threads=self.threads)
+        return tp.report(records, self.standings, self.rejects, stage=self._stage())
+
+    def _stage(self):
+        """ Extra stages over records with tour winners: binary output and statistics if they are made"""
+        stages = [stage.records for stage in (self._binary, self.stats) if stage is not None]
+        if not stages:
+            return None
+        if len(stages) == 1:
+            return stages[0]
+
+        def stage(records):
+            for function in stages:
+                records = function(records)
+            return records
+        return stage
+
+    def _scorer(self):
+        if self.score_cache is not None:
+            return self.score_cache.score
+        return tp.bowling_score if self.use_bowling else be.score_game
+
+    @property
+    def tour_counter(self):
+        return self.standings.tours
+
+    @tour_counter.setter
+    def tour_counter(self, tour_counter):
+        self.standings.tours = tour_counter
+
+    def tournament_table(self, sort_by='wins', top=None, page=1, page_size=None, output_format='ascii', stream=None):
+        """
+        Write standings table in one write() call, see tournament_table.ranked_rows for sorting and pages
+        :param output_format: 'ascii', 'csv' or 'json'
+        :param stream: any object with write() method, sys.stdout by default
+        :return: amount of players in the table
+        """
+        import tournament_table as tt
+        return tt.write_table(self.standings, stream, output_format=output_format, sort_by=sort_by, top=top,
+                              page=page, page_size=page_size)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized scoring of many bowling games with NumPy.
+Games are encoded into a matrix of throw codes (one row per game, padded to 21 throws)
+and points for all rows are counted with array operations: strike and spare bonuses
+are taken from the same matrix shifted by one and two throws.
+NumPy is optional, without it bowling_engine.score_many is used.
+"""
+import bowling_engine as be
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+THROWS = 21
+EMPTY = 12
+BAD = 13
+
+if np is not None:
+    # byte -> throw code, padding byte is 0
+    _CODE_LOOKUP = np.full(256, BAD, dtype=np.uint8)
+    _CODE_LOOKUP[np.frombuffer(be.VALID_BYTES, dtype=np.uint8)] = np.frombuffer(
+        be.VALID_BYTES.translate(be.CODE_MAP), dtype=np.uint8)
+    _CODE_LOOKUP[0] = EMPTY
+
+
+def encode(results, width=THROWS):
+    """
+    Encode game results into a matrix of throw codes
+    :param results: sequence of bowling game results
+    :param width: amount of throws in a row, longer results are cut
+    :return: tuple (uint8 matrix of codes, int32 array of result lengths)
+    """
+    lengths = np.fromiter((len(result) for result in results), dtype=np.int32, count=len(results))
+    raw = b''.join(result.encode('utf-8')[:width].ljust(width, b'\0') for result in results)
+    codes = _CODE_LOOKUP[np.frombuffer(raw, dtype=np.uint8).reshape(len(results), width)]
+    return codes, lengths
+
+
+def score_encoded(codes, lengths, local_rules=True):
+    """
+    Count points of encoded games
+    :param codes: matrix of throw codes made by encode()
+    :param lengths: lengths of game results
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :return: tuple (uint16 array of points, uint8 array of error codes)
+    """
+    rows, width = codes.shape
+    columns = np.arange(width)
+    present = columns < lengths[:, None]
+    strike = (codes == be.STRIKE) & present
+    spare = (codes == be.SPARE) & present
+    regular = (codes < 10) & present
+    pins = np.where(regular, codes, 0).astype(np.int32)
+    previous = np.zeros_like(pins)
+    previous[:, 1:] = pins[:, :-1]
+
+    first = np.zeros(codes.shape, dtype=bool)
+    is_first = np.ones(rows, dtype=bool)
+    for column in range(width):
+        first[:, column] = is_first & present[:, column]
+        is_first = ~is_first | strike[:, column]
+    second = present & ~first
+
+    error_codes = np.zeros(codes.shape, dtype=np.uint8)
+    if local_rules:
+        error_codes[second & regular & (previous + pins > 10)] = be.ERR_FRAME_OVERFLOW
+    error_codes[strike & second] = be.ERR_MISPLACED_STRIKE
+    error_codes[spare & first] = be.ERR_MISPLACED_SPARE
+    has_error = error_codes.any(axis=1)
+    error_column = np.argmax(error_codes > 0, axis=1)
+
+    frame_points = np.where(second & regular, previous + pins, 0)
+    if local_rules:
+        totals = (20 * strike + 15 * spare + frame_points).sum(axis=1)
+    else:
+        totals = (10 * strike + 10 * spare + frame_points).sum(axis=1)
+
+    if not local_rules:
+        value = np.where(strike, 10, np.where(spare, 10 - previous, pins))
+        next_value = np.zeros_like(value)
+        next_value[:, :-1] = value[:, 1:]
+        after_next_value = np.zeros_like(value)
+        after_next_value[:, :-2] = value[:, 2:]
+        has_next = np.zeros_like(present)
+        has_next[:, :-1] = present[:, 1:]
+        has_after_next = np.zeros_like(present)
+        has_after_next[:, :-2] = present[:, 2:]
+        strike_bonus = np.where(has_next, next_value + np.where(has_after_next, after_next_value, 10), 10)
+        spare_bonus = np.where(has_next, next_value, 10)
+        totals = totals + (strike_bonus * strike + spare_bonus * spare).sum(axis=1)
+
+    errors = np.where(has_error, error_codes[np.arange(rows), error_column], be.ERR_OK)
+    errors = np.where(~has_error & (first.sum(axis=1) != 10), be.ERR_WRONG_FRAME_COUNT, errors)
+    wrong_length = (lengths < be.MIN_SYMBOLS) | (lengths > be.MAX_SYMBOLS)
+    errors = np.where(wrong_length, be.ERR_WRONG_LENGTH, errors)
+    bad_symbol = ((codes == BAD) | ((codes == EMPTY) & present)).any(axis=1)
+    errors = np.where(bad_symbol, be.ERR_BAD_SYMBOL, errors)
+    totals = np.where(errors == be.ERR_OK, totals, 0)
+    return totals.astype(np.uint16), errors.astype(np.uint8)
+
+
+def score_many(results, local_rules=True):
+    """
+    Count points of many games at once, vectorized if NumPy is installed
+    :param results: iterable of bowling game results
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :return: tuple (points, error codes), NumPy arrays or arrays from bowling_engine.score_many
+    """
+    if np is None:
+        return be.score_many(results, local_rules=local_rules)
+    results = list(results)
+    codes, lengths = encode(results)
+    totals, errors = score_encoded(codes, lengths, local_rules=local_rules)
+    # symbols after the last encoded throw are not seen in the matrix
+    for row in np.flatnonzero(lengths > THROWS):
+        totals[row], errors[row] = be.score_game(results[row], local_rules)
+    return totals, errors
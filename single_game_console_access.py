@@ -1,6 +1,6 @@
 """ Console script for bowling.py module """
 import argparse
-import bowling as bw
+# bowling is imported in main() after arguments are parsed, so help and argument errors don't load it
 
 
 def str_to_bool(string):
@@ -19,22 +19,47 @@ def str_to_bool(string):
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
 
-bowling_parser = argparse.ArgumentParser('Input your bowling game result. It should consist of 10 frames with '
-                                         'correct game rules. Example - 3271-/44X--2/X43-8')
+def make_parser():
+    bowling_parser = argparse.ArgumentParser('Input your bowling game result. It should consist of 10 frames with '
+                                             'correct game rules. Example - 3271-/44X--2/X43-8')
 
-bowling_parser.add_argument('-r', '--result', required=True, help='Game result in 1 string without spaces.'
-                                                                  'Example - 9-4/529/8/XX-6311/')
-bowling_parser.add_argument('-l', '--local_rules', type=str_to_bool,
-                            help='Choose rules for counting game result:'
-                                 'pick True if you want to use local,'
-                                 'pick False for tournament rules')
+    bowling_parser.add_argument('-r', '--result', required=True, help='Game result in 1 string without spaces.'
+                                                                      'Example - 9-4/529/8/XX-6311/')
+    bowling_parser.add_argument('-l', '--local_rules', type=str_to_bool,
+                                help='Choose rules for counting game result:'
+                                     'pick True if you want to use local,'
+                                     'pick False for tournament rules')
+    bowling_parser.add_argument('-p', '--profile', action='store_true',
+                                help='Print time of scoring stages and counters to stderr')
+    return bowling_parser
 
-bowling_result = vars(bowling_parser.parse_args())
-game_checker = bw.Bowling(**bowling_result)
-game_checker.check_result()
-game_checker.print_result()
+
+def main(argv=None):
+    """
+    Count points of one game and print them
+    :param argv: command line arguments, sys.argv by default
+    """
+    bowling_result = vars(make_parser().parse_args(argv))
+    profile = bowling_result.pop('profile')
+
+    import bowling as bw
+    import bowling_metrics as bm
+    if profile:
+        bm.enable([bm.text_exporter()])
+    game_checker = bw.Bowling(**bowling_result)
+    game_checker.check_result()
+    if bm.ACTIVE is not None:
+        bm.ACTIVE.count_game(game_checker.game_result_to_check, game_checker.error)
+    game_checker.print_result()
+    bm.disable()
+    return game_checker
+
+
+if __name__ == '__main__':
+    main()
 
 
 # input example
 # python3 single_game_console_access.py -r 1/X3-5/X8154-57/X -l true
 # python3 single_game_console_access.py -r 1/X3-5/X8154-57/X -l false
+# python3 single_game_console_access.py -r 1/X3-5/X8154-57/X -l false --profile
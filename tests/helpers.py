@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+""" Paths and base test case shared by test modules"""
+import os
+import tempfile
+import unittest
+
+import bowling_tournament as bt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOURNAMENT_FILE = os.path.join(ROOT, 'tournament.txt')
+
+
+def read(path):
+    with open(path, encoding='UTF8') as file:
+        return file.read()
+
+
+class TournamentTestCase(unittest.TestCase):
+    """ Test case with a temporary directory where tournament.txt is analyzed"""
+    # BowlingTournament arguments used by every analyze() of the test case
+    options = {}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_file = self.path('tournament_result.txt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def analyze(self, name, **kwargs):
+        """ Analyze tournament.txt into report {name}.txt of the temporary directory"""
+        tournament = bt.BowlingTournament(TOURNAMENT_FILE, self.path(f'{name}.txt'), **dict(self.options, **kwargs))
+        tournament.analyze_input_file()
+        return tournament
@@ -160,6 +160,26 @@ class BowlingTest(unittest.TestCase):
 
         self.game._game_state.run.assert_called_once()
 
+    def test_check_result_error(self):
+        game = bw.Bowling('1/X3-5/X8954-57/X')
+        game._game_state.run = Mock()
+
+        error = game.check_result()
+
+        self.assertEqual(error, game.error)
+        self.assertEqual(game.error, bw.be.ERR_FRAME_OVERFLOW)
+        self.assertEqual(game.error_position, 9)
+        self.assertEqual(game.total_result, 0)
+        game._game_state.run.assert_not_called()
+
+    def test_check_result_validate_only(self):
+        self.game._game_state.run = Mock()
+
+        error = self.game.check_result(validate_only=True)
+
+        self.assertEqual(error, bw.be.ERR_OK)
+        self.game._game_state.run.assert_not_called()
+
     def test_local_run(self):  # 1/X3-5/X8154-57/X
         self.game._state.spare = Mock()
         self.game._state.strike = Mock()
@@ -208,6 +228,15 @@ class BowlingTest(unittest.TestCase):
 
         self.assertEqual(new_game.total_result, 40)
 
+    def test_scorecard(self):
+        game = bw.Bowling('1/X3-5/X8154-57/X', local_rules=False)
+        game.check_result()
+
+        card = game.scorecard()
+
+        self.assertEqual(card.tolist(), [20, 33, 36, 56, 75, 84, 93, 98, 118, 138])
+        self.assertEqual(card[-1], game.total_result)
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import bowling_cache as bc
+import bowling_engine as be
+import bowling_tournament as bt
+from helpers import TOURNAMENT_FILE
+
+
+class ScoreCacheTest(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = bc.ScoreCache(max_size=4)
+
+        self.assertEqual(cache.score('1/X3-5/X8154-57/X'), (131, be.ERR_OK))
+        self.assertEqual(cache.score('1/X3-5/X8154-57/X'), (131, be.ERR_OK))
+        self.assertEqual(cache.score('1/X3-5/X8154-57/X', local_rules=False), (138, be.ERR_OK))
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_eviction(self):
+        scorer = Mock(return_value=(0, be.ERR_OK))
+        cache = bc.ScoreCache(max_size=2, scorer=scorer)
+
+        cache.score('a')
+        cache.score('b')
+        cache.score('a')
+        cache.score('c')
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertIn(('a', True), cache)
+        self.assertNotIn(('b', True), cache)
+        self.assertEqual(scorer.call_count, 3)
+        self.assertEqual(cache.stats(), {'size': 2, 'max_size': 2, 'hits': 1, 'misses': 3, 'evictions': 1})
+
+    def test_wrong_size(self):
+        with self.assertRaises(ValueError):
+            bc.ScoreCache(max_size=0)
+
+    def test_tournament_with_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = os.path.join(tmp, 'plain.txt')
+            cached = os.path.join(tmp, 'cached.txt')
+            cache = bc.ScoreCache()
+            bt.BowlingTournament(TOURNAMENT_FILE, plain, local_rules=False).analyze_input_file()
+            bt.BowlingTournament(TOURNAMENT_FILE, cached, local_rules=False,
+                                 score_cache=cache).analyze_input_file()
+            with open(plain, encoding='UTF8') as plain_file, open(cached, encoding='UTF8') as cached_file:
+                self.assertEqual(plain_file.read(), cached_file.read())
+        self.assertGreater(cache.hits, 0)
+
+    def test_cache_with_threads_or_workers(self):
+        for arguments in ({'threads': 2}, {'workers': 2}):
+            with self.subTest(arguments=arguments), self.assertRaises(ValueError):
+                bt.BowlingTournament(TOURNAMENT_FILE, score_cache=bc.ScoreCache(), **arguments)
+
+
+class DiskScoreCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'scores.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_kept_between_runs(self):
+        scorer = Mock(side_effect=be.score_game)
+        with bc.DiskScoreCache(self.path, scorer=scorer) as cache:
+            self.assertEqual(cache.score('1/X3-5/X8154-57/X'), (131, be.ERR_OK))
+            self.assertEqual(cache.score('1/X3-5/X8154-57/X'), (131, be.ERR_OK))
+            self.assertEqual(cache.score('1/X3-5/X8154-57/X', local_rules=False), (138, be.ERR_OK))
+        with bc.DiskScoreCache(self.path, scorer=scorer) as cache:
+            self.assertEqual(len(cache), 2)
+            self.assertIn(('1/X3-5/X8154-57/X', False), cache)
+            self.assertEqual(cache.score('1/X3-5/X8154-57/X', local_rules=False), (138, be.ERR_OK))
+            self.assertEqual(cache.stats(), {'size': 2, 'max_size': 100000, 'hits': 1, 'misses': 0, 'evictions': 0})
+        self.assertEqual(scorer.call_count, 2)
+
+    def test_batches_and_eviction(self):
+        with bc.DiskScoreCache(self.path, max_size=3, batch_size=2) as cache:
+            cache.score('XXXXXXXXXX')
+            cache.score('1111111111')
+        with bc.DiskScoreCache(self.path, max_size=3, batch_size=2) as cache:
+            cache.score('XXXXXXXXXX')
+            cache.score('2222222222')
+            cache.score('3333333333')
+            self.assertEqual(cache.evictions, 1)
+        with bc.DiskScoreCache(self.path, max_size=3) as cache:
+            self.assertIn(('XXXXXXXXXX', True), cache)
+            self.assertNotIn(('1111111111', True), cache)
+            self.assertEqual(len(cache), 3)
+
+    def test_other_engine_version(self):
+        with bc.DiskScoreCache(self.path) as cache:
+            cache.score('XXXXXXXXXX')
+        with patch.object(be, 'ENGINE_VERSION', be.ENGINE_VERSION + 1):
+            with bc.DiskScoreCache(self.path) as cache:
+                self.assertEqual(len(cache), 0)
+
+    def test_tournament_with_disk_cache(self):
+        outputs = []
+        for run in range(2):
+            output = os.path.join(self.tmp.name, f'result_{run}.txt')
+            with bc.DiskScoreCache(self.path) as cache:
+                bt.BowlingTournament(TOURNAMENT_FILE, output, local_rules=False, score_cache=cache).analyze_input_file()
+            with open(output, encoding='UTF8') as file:
+                outputs.append(file.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(cache.misses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import random
+import sys
+import threading
+import unittest
+from array import array
+
+import bowling as bw
+import bowling_engine as be
+import bowling_live as bl
+from helpers import TOURNAMENT_FILE
+
+
+def bowling_total(result, local_rules):
+    game = bw.Bowling(result, local_rules=local_rules)
+    game.check_result()
+    return game.total_result
+
+
+def corpus():
+    games = ['1/X3-5/X8154-57/X', 'X4/34', 'XXXXXXXXXX', '--------------------', '5/5/5/5/5/5/5/5/5/5/',
+             'XXXXXXXXX5', '9-4/529/8/XX-6311/', '3271-/44X--2/X43-8', 'XX/34', '1/X3-5/X8154-57/XX']
+    with open(TOURNAMENT_FILE, encoding='UTF8') as file:
+        for line in file:
+            line = line.split()
+            if len(line) == 2 and not line[0].startswith(('###', 'winner')):
+                games.append(line[1])
+    return games
+
+
+class BowlingEngineTest(unittest.TestCase):
+
+    def test_local_rules(self):
+        self.assertEqual(be.score_game('1/X3-5/X8154-57/X'), (131, be.ERR_OK))
+
+    def test_tournament_rules(self):
+        self.assertEqual(be.score_game('1/X3-5/X8154-57/X', local_rules=False), (138, be.ERR_OK))
+        self.assertEqual(be.score_game('XXXXXXXXXX', local_rules=False), (290, be.ERR_OK))
+
+    def test_errors(self):
+        self.assertEqual(be.score_game('1/X3-5/X8154-57/A'), (0, be.ERR_BAD_SYMBOL))
+        self.assertEqual(be.score_game('X4/34'), (0, be.ERR_WRONG_LENGTH))
+        self.assertEqual(be.score_game('/1X3-5/X8154-57/X'), (0, be.ERR_MISPLACED_SPARE))
+        self.assertEqual(be.score_game('1X3-5/X8154-57/XX'), (0, be.ERR_MISPLACED_STRIKE))
+        self.assertEqual(be.score_game('1/X3-5/X8954-57/X'), (0, be.ERR_FRAME_OVERFLOW))
+        self.assertEqual(be.score_game('1/X3-5/X8154-57/XX'), (0, be.ERR_WRONG_FRAME_COUNT))
+
+    def test_validate(self):
+        self.assertIs(be.validate('1/X3-5/X8154-57/X'), be.VALID)
+        self.assertEqual(be.validate('1/X3-5/X8154-57/A'), (be.ERR_BAD_SYMBOL, 16))
+        self.assertEqual(be.validate('X4/34'), (be.ERR_WRONG_LENGTH, None))
+        self.assertEqual(be.validate('/1X3-5/X8154-57/X'), (be.ERR_MISPLACED_SPARE, 0))
+        self.assertEqual(be.validate('1X3-5/X8154-57/XX'), (be.ERR_MISPLACED_STRIKE, 1))
+        self.assertEqual(be.validate('1/X3-5/X8954-57/X'), (be.ERR_FRAME_OVERFLOW, 9))
+        self.assertIs(be.validate('1/X3-5/X8954-57/X', local_rules=False), be.VALID)
+        self.assertEqual(be.validate('1/X3-5/X8154-57/XX'), (be.ERR_WRONG_FRAME_COUNT, None))
+
+    def test_error_message(self):
+        self.assertEqual(be.error_message(be.ERR_MISPLACED_STRIKE, 1), "Second throw can't be strike (throw 2)")
+        self.assertEqual(be.error_message(be.ERR_WRONG_LENGTH), 'Incorrect amount of symbols, expected from 10 to 20')
+
+    def test_same_as_bowling(self):
+        for game in corpus():
+            for local_rules in (True, False):
+                with self.subTest(game=game, local_rules=local_rules):
+                    self.assertEqual(be.score(game, local_rules), bowling_total(game, local_rules))
+
+    def test_same_as_bowling_random(self):
+        rnd = random.Random(42)
+        for _ in range(2000):
+            game = ''.join(rnd.choice('123456789-Xx/') for _ in range(rnd.randint(10, 20)))
+            for local_rules in (True, False):
+                with self.subTest(game=game, local_rules=local_rules):
+                    self.assertEqual(be.score(game, local_rules), bowling_total(game, local_rules))
+
+    def test_score_many(self):
+        games = corpus() + ['1/X3-5/X8154-57/A', 'X4/34', '1X3-5/X8154-57/XX']
+        for local_rules in (True, False):
+            totals, errors = be.score_many(iter(games), local_rules=local_rules)
+            self.assertEqual(totals.typecode, 'H')
+            self.assertEqual(errors.typecode, 'B')
+            self.assertEqual(list(zip(totals, errors)), [be.score_game(game, local_rules) for game in games])
+
+    def test_frame_tokens(self):
+        self.assertEqual(be.frame_tokens('1/X3-5/X8154-57/X'),
+                         ['1/', 'X', '3-', '5/', 'X', '81', '54', '-5', '7/', 'X'])
+        self.assertEqual(be.frame_tokens('XXXXXXXXX5'), ['X'] * 9 + ['5'])
+
+    def test_local_frames(self):
+        self.assertEqual(be.LOCAL_FRAMES[b'X'], 20)
+        self.assertEqual(be.LOCAL_FRAMES[b'-/'], 15)
+        self.assertEqual(be.LOCAL_FRAMES[b'55'], 10)
+        self.assertNotIn(b'56', be.LOCAL_FRAMES)
+        self.assertEqual(be.score_local_frames('1/X3-5/X8154-57/X'), ([15, 20, 3, 15, 20, 9, 9, 5, 15, 20], be.ERR_OK))
+        self.assertEqual(be.score_local_frames('XXXXXXXXX5'), ([20] * 9 + [0], be.ERR_OK))
+        self.assertEqual(be.score_local_frames('X3XXXXXXXXX'), ([], be.ERR_MISPLACED_STRIKE))
+
+    def test_local_frames_same_as_score_game(self):
+        rnd = random.Random(7)
+        games = corpus() + [''.join(rnd.choice('123456789-Xx/') for _ in range(rnd.randint(9, 21)))
+                            for _ in range(2000)]
+        for game in games:
+            with self.subTest(game=game):
+                points, error = be.score_local_frames(game)
+                self.assertEqual((sum(points), error), be.score_game(game))
+
+    def test_scorecard(self):
+        self.assertEqual(be.scorecard('1/X3-5/X8154-57/X'),
+                         (array('H', [15, 35, 38, 53, 73, 82, 91, 96, 111, 131]), be.ERR_OK))
+        self.assertEqual(be.scorecard('1/X3-5/X8154-57/X', local_rules=False),
+                         (array('H', [20, 33, 36, 56, 75, 84, 93, 98, 118, 138]), be.ERR_OK))
+        self.assertEqual(be.scorecard('XXXXXXXXX5', local_rules=False)[0].tolist(),
+                         [30, 60, 90, 120, 150, 180, 210, 235, 260, 260])
+        self.assertEqual(be.scorecard('X3XXXXXXXXX'), (array('H', bytes(20)), be.ERR_MISPLACED_STRIKE))
+
+    def test_scorecard_same_as_live_game(self):
+        rnd = random.Random(11)
+        games = corpus() + [''.join(rnd.choice('123456789-Xx/') for _ in range(rnd.randint(9, 21)))
+                            for _ in range(2000)]
+        for local_rules in (True, False):
+            for game in games:
+                with self.subTest(game=game, local_rules=local_rules):
+                    card, error = be.scorecard(game, local_rules)
+                    self.assertEqual((card[-1], error), be.score_game(game, local_rules))
+                    if not error:
+                        live = bl.LiveGame(local_rules)
+                        for symbol in game:
+                            live.add_throw(symbol)
+                        points = live.frame_points(final=True)
+                        self.assertEqual(card.tolist(), [sum(points[:frame + 1]) for frame in range(be.FRAMES)])
+
+    def test_scorecards(self):
+        games = ['1/X3-5/X8154-57/X', 'X3XXXXXXXXX', 'XXXXXXXXXX']
+        cards, errors = be.scorecards(iter(games), local_rules=False)
+        self.assertEqual(len(cards), 3 * be.FRAMES)
+        self.assertEqual(errors.tolist(), [be.ERR_OK, be.ERR_MISPLACED_STRIKE, be.ERR_OK])
+        for index, game in enumerate(games):
+            self.assertEqual(be.card_view(cards, index).tolist(), be.scorecard(game, local_rules=False)[0].tolist())
+
+        buffer = bytearray(2 * 4 * be.FRAMES)
+        view = memoryview(buffer).cast('H')
+        filled, _ = be.scorecards(games, cards=view)
+        self.assertIs(filled, view)
+        self.assertEqual(view[be.FRAMES - 1], 131)
+        card = be.card_view(view, 2)
+        view[3 * be.FRAMES - 1] = 1
+        self.assertEqual(card[-1], 1)
+        with self.assertRaises(ValueError):
+            be.scorecards(games * 2, cards=view)
+
+    def test_concurrent_scoring(self):
+        rnd = random.Random(5)
+        games = corpus() + [''.join(rnd.choice('123456789-Xx/') for _ in range(rnd.randint(9, 21)))
+                            for _ in range(1000)]
+        expected = {local_rules: [(be.score_game(game, local_rules), be.scorecard(game, local_rules))
+                                  for game in games] for local_rules in (True, False)}
+        threads_amount = 8
+        barrier = threading.Barrier(threads_amount)
+        mismatches = []
+
+        def work(seed):
+            order = list(range(len(games)))
+            random.Random(seed).shuffle(order)
+            card = array('H', bytes(2 * be.FRAMES))
+            barrier.wait()
+            for local_rules in (seed % 2 == 0, seed % 2 == 1):
+                for index in order:
+                    error = be.fill_scorecard(games[index], card, local_rules)
+                    result = (be.score_game(games[index], local_rules), (card, error))
+                    if result != expected[local_rules][index]:
+                        mismatches.append((games[index], local_rules))
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=work, args=(seed,)) for seed in range(threads_amount)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
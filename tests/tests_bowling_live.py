@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import unittest
+
+import bowling_engine as be
+import bowling_live as bl
+
+
+def play(throws, local_rules=True):
+    game = bl.LiveGame(local_rules=local_rules)
+    for symbol in throws:
+        error = game.add_throw(symbol)
+        if error:
+            raise AssertionError(f'{symbol} is not accepted: {be.error_message(error)}')
+    return game
+
+
+class LiveGameTest(unittest.TestCase):
+
+    def test_running_total(self):
+        game = bl.LiveGame()
+        totals = []
+        for symbol in '1/X3-5/X8154-57/X':
+            game.add_throw(symbol)
+            totals.append(game.total)
+
+        self.assertEqual(totals[:6], [0, 15, 35, 35, 38, 38])
+        self.assertEqual(game.result(), (131, be.ERR_OK))
+        self.assertTrue(game.is_finished)
+
+    def test_frame_points_tournament(self):
+        game = play('1/X3-5/X8154-57/X', local_rules=False)
+
+        self.assertEqual(game.frame_points(), [20, 13, 3, 20, 19, 9, 9, 5, 20, 10])
+        self.assertEqual(game.frame_points(final=True), [20, 13, 3, 20, 19, 9, 9, 5, 20, 20])
+        self.assertEqual(game.result(), be.score_game('1/X3-5/X8154-57/X', local_rules=False))
+
+    def test_pending_bonuses(self):
+        game = play('X5', local_rules=False)
+
+        self.assertEqual(game.pending_bonuses, [(1, 1)])
+        self.assertEqual(game.frame, 2)
+        self.assertEqual(game.throw_in_frame, 2)
+        game.add_throw('/')
+        self.assertEqual(game.pending_bonuses, [(2, 1)])
+        self.assertEqual(game.frame_points(), [20, 10])
+        self.assertEqual(game.frame, 3)
+        self.assertEqual(game.throw_in_frame, 1)
+
+    def test_rejected_throws(self):
+        game = play('X')
+
+        self.assertEqual(game.add_throw('/'), be.ERR_MISPLACED_SPARE)
+        self.assertEqual(game.add_throw('0'), be.ERR_BAD_SYMBOL)
+        self.assertEqual(game.throws, 'X')
+        game = play('XXXXXXXXXX')
+        self.assertEqual(game.add_throw('1'), be.ERR_WRONG_FRAME_COUNT)
+        self.assertEqual(game.result(), be.score_game('XXXXXXXXXX'))
+
+    def test_unfinished_game(self):
+        self.assertEqual(play('X').result(), (0, be.ERR_WRONG_LENGTH))
+        self.assertEqual(play('1111111111').result(), (0, be.ERR_WRONG_FRAME_COUNT))
+
+    def test_serialization(self):
+        game = play('1/X3-5/X8', local_rules=False)
+        restored = bl.LiveGame.from_dict(game.to_dict())
+        unpickled = pickle.loads(pickle.dumps(game))
+
+        for copy in (restored, unpickled):
+            self.assertEqual(copy.throws, game.throws)
+            self.assertEqual(copy.total, game.total)
+            self.assertEqual(copy.frame_points(), game.frame_points())
+            self.assertEqual(copy.pending_bonuses, game.pending_bonuses)
+        with self.assertRaises(ValueError):
+            bl.LiveGame.from_dict({'throws': 'X/', 'local_rules': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
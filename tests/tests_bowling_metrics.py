@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import bowling as bw
+import bowling_metrics as bm
+import bowling_tournament as bt
+from helpers import TOURNAMENT_FILE
+
+
+class BowlingMetricsTest(unittest.TestCase):
+
+    def tearDown(self):
+        bm.disable()
+
+    def test_disabled(self):
+        records = [1, 2]
+
+        bw.Bowling('1/X3-5/X8154-57/X').check_result()
+
+        self.assertIsNone(bm.ACTIVE)
+        self.assertIs(bt.tp.timed('parse', records), records)
+
+    def test_bowling_timers(self):
+        metrics = bm.enable()
+
+        bw.Bowling('1/X3-5/X8154-57/X').check_result()
+
+        self.assertEqual(set(metrics.timers), {'bowling_init', 'check_result'})
+
+    def test_count_game(self):
+        metrics = bm.Metrics()
+
+        metrics.count_game('1/X3-5/X8154-57/X', 0)
+        metrics.count_game('1/X3-5/X8154-57/A', 1)
+
+        self.assertEqual(metrics.counters, {'games': 2, 'errors': 1, 'strikes': 5, 'spares': 6})
+
+    def test_inner_stage_time_is_not_counted_twice(self):
+        metrics = bm.Metrics()
+
+        items = list(metrics.timed('outer', metrics.timed('inner', range(1000))))
+
+        self.assertEqual(len(items), 1000)
+        self.assertGreater(metrics.timers['inner'], 0)
+        self.assertLess(metrics.timers['outer'], metrics.timers['inner'] * 10)
+
+    def test_tournament_metrics_and_export(self):
+        exporter = Mock()
+        bm.enable([exporter])
+        with tempfile.TemporaryDirectory() as tmp:
+            bt.BowlingTournament(TOURNAMENT_FILE, os.path.join(tmp, 'result.txt')).analyze_input_file()
+        bm.disable()
+
+        snapshot = exporter.call_args[0][0]
+        self.assertEqual(snapshot['counters']['games'], 30)
+        self.assertEqual(snapshot['counters']['tours'], 6)
+        self.assertGreater(snapshot['counters']['bytes_written'], 0)
+        self.assertTrue({'parse', 'score', 'winner', 'report', 'write'} <= set(snapshot['timers']))
+
+    def test_text_exporter(self):
+        stream = io.StringIO()
+
+        bm.text_exporter(stream)({'timers': {'parse': 0.5}, 'counters': {'games': 3}})
+
+        self.assertIn('|parse               |     0.500000 s|', stream.getvalue())
+        self.assertIn('|games               |              3|', stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
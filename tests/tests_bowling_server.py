@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+import bowling_cache as bc
+import bowling_engine as be
+import bowling_server as bs
+import bowling_tournament as bt
+from helpers import TOURNAMENT_FILE
+
+
+class ScoringServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await bs.ScoringServer(local_rules=True).start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def ask(self, lines):
+        return await bs.request(self.server.host, self.server.port, lines)
+
+    async def test_pipelined_games(self):
+        answer = await self.ask(['GAME 1/X3-5/X8154-57/X', 'GAME 1/X3-5/X8154-57/X tournament',
+                                 'GAME X/XXXXXXXXX', 'HELLO'])
+
+        self.assertEqual(answer[:2], ['OK 131', 'OK 138'])
+        self.assertTrue(answer[2].startswith(f'ERROR {be.ERR_MISPLACED_SPARE} '))
+        self.assertTrue(answer[3].startswith('ERROR 0 '))
+        self.assertEqual(self.server.requests, 4)
+
+    async def test_tour_block(self):
+        with open(TOURNAMENT_FILE, encoding='UTF8') as file:
+            lines = file.read().splitlines()
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'result.txt')
+            bt.BowlingTournament(TOURNAMENT_FILE, output, local_rules=False).analyze_input_file()
+            with open(output, encoding='UTF8') as file:
+                expected = file.read().splitlines()
+
+        answer = await self.ask(['TOUR tournament'] + lines + [bs.END, 'GAME XXXXXXXXXX'])
+
+        self.assertEqual(answer[:-2], expected)
+        self.assertEqual(answer[-2:], [bs.END, 'OK 200'])
+
+    async def test_too_long_line(self):
+        await self.server.close()
+        self.server = await bs.ScoringServer(max_line=64).start()
+
+        answer = await self.ask([f'GAME {"X" * 200}', 'GAME XXXXXXXXXX'])
+
+        self.assertEqual(answer, ['ERROR 0 request line too long'])
+        self.assertEqual(await self.ask(['TOUR', f'Алексей {"X" * 200}', bs.END]), ['ERROR 0 request line too long'])
+
+    async def test_bad_lines(self):
+        answer = await self.ask(['TOUR', '### Tour 1', 'Алексей', 'Павел XXXXXXXXXX', 'Давид X/XXXXXXXXX',
+                                 'winner is', bs.END, 'GAME XXXXXXXXXX'])
+
+        self.assertEqual(answer[0], 'ERROR 0 player line without result Алексей')
+        self.assertEqual(answer[1:3], ['### Tour 1', 'Павел XXXXXXXXXX 200'])
+        self.assertTrue(answer[3].startswith(f'{bs.REJECT} Давид X/XXXXXXXXX '))
+        self.assertEqual(answer[4:], ['winner is Павел', bs.END, 'OK 200'])
+
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        writer.write(b'GAME \xff\nGAME XXXXXXXXXX\n')
+        writer.write_eof()
+        answer = (await reader.read()).decode('UTF8').splitlines()
+        writer.close()
+        await writer.wait_closed()
+
+        self.assertEqual(answer, ['ERROR 0 request line is not UTF-8', 'OK 200'])
+
+    async def test_shared_cache(self):
+        await self.server.close()
+        self.server = await bs.ScoringServer(score_cache=bc.ScoreCache()).start()
+
+        await self.ask(['GAME 1/X3-5/X8154-57/X'])
+        answer = await self.ask(['GAME 1/X3-5/X8154-57/X'])
+
+        self.assertEqual(answer, ['OK 131'])
+        self.assertEqual(self.server.score_cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+import bowling_tournament as bt
+import helpers
+from helpers import TOURNAMENT_FILE
+
+FIRST_TOUR = ('### Tour 1\n'
+              'Алексей 35612/----2/8-6/3/4/ 98\n'
+              'Татьяна 62334/6/4/44X361/X 134\n'
+              'Давид --8/--8/4/8/-224---- 60\n'
+              'Павел ----15623113-95/7/26 68\n'
+              'Роман 7/428/--4-533/34811/ 91\n'
+              'winner is Татьяна\n')
+
+
+class BowlingTournamentTest(helpers.TournamentTestCase):
+
+    def report(self, name='tournament_result', **kwargs):
+        """ Tournament analyzed into report {name}.txt and text of the report"""
+        tournament = self.analyze(name, **kwargs)
+        return tournament, helpers.read(tournament.output_file)
+
+    def test_report(self):
+        tournament, report = self.report(local_rules=False)
+
+        self.assertTrue(report.startswith(FIRST_TOUR))
+        self.assertEqual(report.count('### Tour'), 6)
+        self.assertEqual(tournament.tour_counter, 6)
+
+    def test_flush_size_does_not_change_report(self):
+        _, report = self.report(local_rules=False, flush_size=1000)
+        _, small_flush_report = self.report('small', local_rules=False, flush_size=1)
+
+        self.assertEqual(report, small_flush_report)
+
+    def test_bowling_report(self):
+        for local_rules in (True, False):
+            with self.subTest(local_rules=local_rules):
+                _, report = self.report(f'engine_{local_rules}', local_rules=local_rules)
+                _, bowling_report = self.report(f'bowling_{local_rules}', local_rules=local_rules, use_bowling=True)
+
+                self.assertEqual(report, bowling_report)
+
+    def test_parallel_report(self):
+        tournament, report = self.report(local_rules=False)
+        parallel, parallel_report = self.report('parallel', local_rules=False, workers=2)
+
+        self.assertEqual(report, parallel_report)
+        self.assertEqual(tournament.player_played, parallel.player_played)
+        self.assertEqual(tournament.player_winner, parallel.player_winner)
+
+    def test_unicode_whitespace(self):
+        input_file = self.path('tournament.txt')
+        with open(input_file, 'w', encoding='UTF8') as file:
+            file.write('### Tour 1\nА\u00a0Б\tXXXXXXXXXX\nВ\u2003X\t1-1-1-1-1-1-1-1-1-1-\nГ 5/5/5/5/5/5/5/5/5/5-\n'
+                       'winner is Г\n')
+
+        for local_rules in (True, False):
+            with self.subTest(local_rules=local_rules):
+                tournament = bt.BowlingTournament(input_file, self.path(f'text_{local_rules}.txt'),
+                                                  local_rules=local_rules, overwrite=True)
+                mapped = bt.BowlingTournament(input_file, self.path(f'mapped_{local_rules}.txt'),
+                                              local_rules=local_rules, overwrite=True, memory_map=True)
+                tournament.analyze_input_file()
+                mapped.analyze_input_file()
+                with open(tournament.output_file, encoding='UTF8') as file, \
+                        open(mapped.output_file, encoding='UTF8') as mapped_file:
+                    self.assertEqual(file.read(), mapped_file.read())
+                self.assertEqual(tournament.player_played, mapped.player_played)
+                self.assertEqual(tournament.rejects.count, mapped.rejects.count)
+
+    def test_threaded_report(self):
+        tournament, report = self.report(local_rules=False)
+        threaded, threaded_report = self.report('threaded', local_rules=False, threads=4)
+        _, mapped_report = self.report('mapped', local_rules=False, memory_map=True, threads=4)
+
+        self.assertEqual(report, threaded_report)
+        self.assertEqual(report, mapped_report)
+        self.assertEqual(tournament.player_played, threaded.player_played)
+        self.assertEqual(tournament.player_winner, threaded.player_winner)
+
+    def test_memory_mapped_report(self):
+        _, report = self.report(local_rules=False)
+        _, mapped_report = self.report('mapped', local_rules=False, memory_map=True)
+
+        self.assertEqual(report, mapped_report)
+
+    def test_reject_file(self):
+        input_file = self.path('tournament.txt')
+        reject_file = self.path('rejects.txt')
+        with open(input_file, 'w', encoding='UTF8') as file:
+            file.write('### Tour 1\nАлексей\t35612/----2/8-6/3/4/\nПавел\t35612/----2/8-6/3/\nwinner is ...\n')
+        tournament = bt.BowlingTournament(input_file, self.output_file, reject_file=reject_file)
+
+        tournament.analyze_input_file()
+
+        self.assertEqual(tournament.rejects.count, 1)
+        with open(self.output_file, encoding='UTF8') as file:
+            self.assertNotIn('Павел', file.read())
+        with open(reject_file, encoding='UTF8') as file:
+            self.assertEqual(file.read(), 'Павел 35612/----2/8-6/3/ The game should have 10 frames\n')
+
+    def test_incremental(self):
+        input_file = self.path('tournament.txt')
+        clean_file = self.path('clean.txt')
+        with open(TOURNAMENT_FILE, encoding='UTF8') as file:
+            content = file.read()
+        with open(input_file, 'w', encoding='UTF8') as file:
+            file.write(content)
+        first = bt.BowlingTournament(input_file, self.output_file, incremental=True)
+        first.analyze_input_file()
+        with open(input_file, 'w', encoding='UTF8') as file:
+            file.write(content.replace('Роман\t7/X8/X4-533/3481X', 'Роман\tXXXXXXXXXX', 1))
+        tournament = bt.BowlingTournament(input_file, self.output_file, incremental=True)
+        tournament.analyze_input_file()
+        clean = bt.BowlingTournament(input_file, clean_file)
+        clean.analyze_input_file()
+
+        self.assertEqual(first.scored_tours, first.tour_counter)
+        self.assertEqual(tournament.scored_tours, 1)
+        with open(self.output_file, encoding='UTF8') as file, open(clean_file, encoding='UTF8') as clean_report:
+            self.assertEqual(file.read(), clean_report.read())
+        for aggregate in ('player_played', 'player_winner', 'player_points', 'player_best'):
+            self.assertEqual(list(getattr(tournament.standings, aggregate).items()),
+                             list(getattr(clean.standings, aggregate).items()))
+        self.assertEqual(tournament.tour_counter, clean.tour_counter)
+
+    def test_incremental_tour_without_winner_line(self):
+        input_file = self.path('tournament.txt')
+        with open(input_file, 'w', encoding='UTF8') as file:
+            file.write('Давид\tXXXXXXXXXX\n### Tour 1\nАлексей\tXXXXXXXXXX\n'
+                       '### Tour 2\nПавел\t1/X3-5/X8154-57/X\nwinner is\n')
+        incremental = bt.BowlingTournament(input_file, self.output_file, incremental=True)
+        incremental.analyze_input_file()
+
+        for number, arguments in enumerate(({}, {'memory_map': True}, {'workers': 2}, {'threads': 2})):
+            with self.subTest(arguments=arguments):
+                clean_file = self.path(f'clean_{number}.txt')
+                clean = bt.BowlingTournament(input_file, clean_file, **arguments)
+                clean.analyze_input_file()
+                with open(self.output_file, encoding='UTF8') as file, open(clean_file, encoding='UTF8') as report:
+                    self.assertEqual(file.read(), report.read())
+                self.assertEqual(incremental.player_winner, clean.player_winner)
+        self.assertEqual(incremental.player_winner, {'Давид': 0, 'Алексей': 0, 'Павел': 1})
+
+    def test_report_writer(self):
+        with bt.ReportWriter(self.output_file, flush_size=2) as report:
+            report.write('a\n')
+            self.assertFalse(os.path.getsize(self.output_file))
+            report.write('b\n')
+            self.assertEqual(os.path.getsize(self.output_file), 4)
+            report.write('c\n')
+        with open(self.output_file, encoding='UTF8') as file:
+            self.assertEqual(file.read(), 'a\nb\nc\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
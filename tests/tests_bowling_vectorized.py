@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+from unittest.mock import patch
+
+import bowling_engine as be
+import bowling_vectorized as bv
+
+
+class BowlingVectorizedTest(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(7)
+        self.games = ['1/X3-5/X8154-57/X', 'XXXXXXXXXX', 'XXXXXXXXX5', '5/5/5/5/5/5/5/5/5/5/', '--------------------',
+                      '1/X3-5/X8154-57/A', 'X4/34', '1X3-5/X8154-57/XX', '1/X3-5/X8954-57/X', '1/X3-5/X8154-57/XX',
+                      'XXXXXXXXXXXXXXXXXXXXXXa']
+        self.games += [''.join(rnd.choice('123456789-Xx/') for _ in range(rnd.randint(10, 20))) for _ in range(2000)]
+
+    @unittest.skipIf(bv.np is None, 'NumPy is not installed')
+    def test_encode(self):
+        codes, lengths = bv.encode(['1/X3-5/X8154-57/X'])
+        self.assertEqual(codes.shape, (1, bv.THROWS))
+        self.assertEqual(list(codes[0, :4]), [1, be.SPARE, be.STRIKE, 3])
+        self.assertEqual(codes[0, -1], bv.EMPTY)
+        self.assertEqual(list(lengths), [17])
+
+    @unittest.skipIf(bv.np is None, 'NumPy is not installed')
+    def test_same_as_engine(self):
+        for local_rules in (True, False):
+            totals, errors = bv.score_many(self.games, local_rules=local_rules)
+            expected = be.score_many(self.games, local_rules=local_rules)
+            self.assertEqual(totals.tolist(), list(expected[0]))
+            self.assertEqual(errors.tolist(), list(expected[1]))
+
+    def test_without_numpy(self):
+        with patch.object(bv, 'np', None):
+            totals, errors = bv.score_many(self.games[:3], local_rules=False)
+        self.assertEqual(list(totals), [138, 290, 260])
+        self.assertEqual(list(errors), [be.ERR_OK] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import single_game_console_access as single
+import tournament_game_console_access as tournament
+from helpers import ROOT, TOURNAMENT_FILE
+
+
+class ConsoleAccessTest(unittest.TestCase):
+
+    def test_single_game(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            game = single.main(['-r', '1/X3-5/X8154-57/X', '-l', 'true'])
+        self.assertEqual(game.total_result, 131)
+        self.assertIn('131', output.getvalue())
+
+    def test_tournament(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'result.txt')
+            output = io.StringIO()
+            with redirect_stdout(output):
+                checker = tournament.main(['-i', TOURNAMENT_FILE, '-o', output_file, '-l', 'false'])
+            self.assertEqual(checker.output_file, output_file)
+            self.assertTrue(os.path.getsize(output_file))
+            self.assertIn(f'Saved at {output_file}, 0 results rejected', output.getvalue())
+
+    def test_reject_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_file = os.path.join(tmp, 'tournament.txt')
+            reject_file = os.path.join(tmp, 'rejects.txt')
+            with open(TOURNAMENT_FILE, encoding='UTF8') as file:
+                lines = file.readlines()
+            lines.insert(1, 'Вадим X/XXXXXXXXX\n')
+            with open(input_file, 'w', encoding='UTF8') as file:
+                file.writelines(lines)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                checker = tournament.main(['-i', input_file, '-o', os.path.join(tmp, 'result.txt'), '-l', 'false',
+                                           '-r', reject_file])
+            self.assertEqual(checker.rejects.count, 1)
+            self.assertIn(f'1 results rejected to {reject_file}', output.getvalue())
+            with open(reject_file, encoding='UTF8') as file:
+                self.assertIn('Вадим X/XXXXXXXXX', file.read())
+
+    def test_batch_arguments(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            tournament.main(['-d', TOURNAMENT_FILE])
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            tournament.main(['-d', TOURNAMENT_FILE, '--output_dir', 'results', '-o', 'result.txt'])
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            tournament.main(['-d', TOURNAMENT_FILE, '--output_dir', 'results', '-r', 'rejects.txt'])
+
+    def test_cache_arguments(self):
+        for arguments in (['-i', TOURNAMENT_FILE, '-t', '4'], ['-i', TOURNAMENT_FILE, '-w', '2'],
+                          ['-d', TOURNAMENT_FILE, '--output_dir', 'results', '-t', '2']):
+            with self.subTest(arguments=arguments), redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                tournament.main(arguments + ['-c', 'scores.db'])
+
+    def test_lazy_imports(self):
+        code = ('import sys, single_game_console_access, tournament_game_console_access\n'
+                'print(sorted({"bowling", "bowling_tournament", "sqlite3", "concurrent.futures"} & set(sys.modules)))')
+        process = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(process.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import bowling_tournament as bt
+import tournament_batch as tbatch
+from helpers import TOURNAMENT_FILE
+
+
+class TournamentBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp.name, 'leagues')
+        self.output_dir = os.path.join(self.tmp.name, 'results')
+        os.mkdir(self.input_dir)
+        for name in ('first', 'second'):
+            shutil.copy(TOURNAMENT_FILE, os.path.join(self.input_dir, f'{name}.txt'))
+        with open(os.path.join(self.input_dir, 'broken.txt'), 'w', encoding='UTF8') as file:
+            file.write('### Tour 1\nАлексей\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_inputs(self):
+        by_dir = tbatch.find_inputs([self.input_dir])
+        by_glob = tbatch.find_inputs([os.path.join(self.input_dir, 'f*.txt'), self.input_dir])
+
+        self.assertEqual([os.path.basename(path) for path in by_dir], ['broken.txt', 'first.txt', 'second.txt'])
+        self.assertEqual([os.path.basename(path) for path in by_glob], ['first.txt', 'broken.txt', 'second.txt'])
+
+    def test_batch(self):
+        single_file = os.path.join(self.tmp.name, 'single.txt')
+        single = bt.BowlingTournament(TOURNAMENT_FILE, single_file, local_rules=False)
+        single.analyze_input_file()
+        with open(single_file, encoding='UTF8') as file:
+            expected = file.read()
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                shutil.rmtree(self.output_dir, ignore_errors=True)
+                summaries = list(tbatch.run_batch(tbatch.find_inputs([self.input_dir]), self.output_dir,
+                                                  workers=workers, local_rules=False))
+
+                self.assertIsNotNone(summaries[0].error)
+                for summary in summaries[1:]:
+                    self.assertIsNone(summary.error)
+                    self.assertEqual((summary.tours, summary.games, summary.rejected), (single.tour_counter, 30, 0))
+                    with open(summary.output_file, encoding='UTF8') as file:
+                        self.assertEqual(file.read(), expected)
+                standings = tbatch.merge_standings(summaries)
+                for name in single.player_played:
+                    played, victories, points, best = single.standings.standing(name)
+                    self.assertEqual(standings.standing(name), (2 * played, 2 * victories, 2 * points, best))
+                self.assertEqual(standings.tours, 2 * single.tour_counter)
+
+    def test_summary_rows(self):
+        summaries = list(tbatch.run_batch(tbatch.find_inputs([self.input_dir]), self.output_dir))
+        rows = list(tbatch.summary_rows(summaries))
+
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(len({len(row) for row in rows}), 1)
+        self.assertTrue(any('first_result.txt' in row for row in rows))
+
+    def test_rerun(self):
+        first = list(tbatch.run_batch(tbatch.find_inputs([self.input_dir]), self.output_dir, local_rules=False))
+        reports = {}
+        for summary in first[1:]:
+            with open(summary.output_file, encoding='UTF8') as file:
+                reports[summary.output_file] = file.read()
+        second = list(tbatch.run_batch(tbatch.find_inputs([self.input_dir]), self.output_dir, local_rules=False))
+
+        self.assertEqual([summary.games for summary in second], [summary.games for summary in first])
+        for output_file, report in reports.items():
+            with open(output_file, encoding='UTF8') as file:
+                self.assertEqual(file.read(), report)
+        self.assertFalse([name for name in os.listdir(self.output_dir) if name.endswith('.tmp')])
+
+    def test_report_over_input(self):
+        shutil.copy(TOURNAMENT_FILE, os.path.join(self.input_dir, 'first_result.txt'))
+
+        with self.assertRaises(ValueError):
+            tbatch.run_batch(tbatch.find_inputs([self.input_dir]), self.input_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
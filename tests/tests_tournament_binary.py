@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import helpers
+import tournament_binary as tb
+import tournament_pipeline as tp
+
+
+class TournamentBinaryTest(helpers.TournamentTestCase):
+
+    def analyze_binary(self, name, **kwargs):
+        """ Tournament analyzed with binary output {name}.bin and path of that file"""
+        binary_file = self.path(f'{name}.bin')
+        return self.analyze(name, binary_file=binary_file, **kwargs), binary_file
+
+    def test_writer_and_reader(self):
+        path = self.path('result.bin')
+        with tb.BinaryWriter(path) as writer:
+            for record in [tp.TourStart(3), tp.PlayerResult('Алексей', 'XXXXXXXXXX', 200, 0),
+                           tp.PlayerResult('Павел', '1111111111', 10, 0), tp.TourWinner(3, 'Алексей'),
+                           tp.TourStart(4), tp.PlayerResult('Павел', '2222222222', 20, 0), tp.TourWinner(4, None)]:
+                writer.add(record)
+
+        with tb.BinaryReport(path) as report:
+            self.assertEqual((report.players, report.tours, report.results), (2, 2, 3))
+            self.assertEqual(report.tour(3), (3, [('Алексей', 'XXXXXXXXXX', 200), ('Павел', '1111111111', 10)],
+                                              'Алексей'))
+            self.assertEqual(report.tour(4).winner, None)
+            self.assertEqual(report.player_games('Павел'), [(3, 'Павел', '1111111111', 10),
+                                                            (4, 'Павел', '2222222222', 20)])
+            self.assertEqual(report.wins('Алексей'), 1)
+            with self.assertRaises(IndexError):
+                report.tour(5)
+            with self.assertRaises(KeyError):
+                report.player('Роман')
+
+    def test_same_as_standings(self):
+        tournament, binary_file = self.analyze_binary('result', local_rules=False)
+
+        with tb.BinaryReport(binary_file) as report:
+            self.assertEqual(report.tours, tournament.tour_counter)
+            for name in tournament.player_played:
+                games = report.player_games(name)
+                self.assertEqual(len(games), tournament.player_played[name])
+                self.assertEqual(sum(game.points for game in games), tournament.standings.player_points[name])
+                self.assertEqual(report.wins(name), tournament.player_winner[name])
+
+    def test_same_file_for_every_mode(self):
+        _, plain = self.analyze_binary('plain')
+        _, mapped = self.analyze_binary('mapped', memory_map=True)
+        _, incremental = self.analyze_binary('incremental', incremental=True)
+
+        with open(plain, 'rb') as file:
+            content = file.read()
+        for path in (mapped, incremental):
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), content)
+
+    def test_not_binary_file(self):
+        path = self.path('result.txt')
+        with open(path, 'wb') as file:
+            file.write(b'x' * 256)
+        with self.assertRaises(ValueError):
+            tb.BinaryReport(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import io
+import itertools
+import unittest
+from unittest.mock import patch
+
+import bowling_engine as be
+import tournament_pipeline as tp
+
+TOUR = ['### Tour 1\n', 'Алексей\t35612/----2/8-6/3/4/\n', 'Татьяна\t62334/6/4/44X361/X\n', '\n',
+        'winner is .........\n']
+
+
+class TournamentPipelineTest(unittest.TestCase):
+
+    def test_parse_lines(self):
+        records = list(tp.parse_lines(TOUR))
+
+        self.assertEqual(records, [tp.TourStart(1),
+                                   tp.PlayerResult('Алексей', '35612/----2/8-6/3/4/', None, None),
+                                   tp.PlayerResult('Татьяна', '62334/6/4/44X361/X', None, None),
+                                   tp.TourEnd(1)])
+
+    def test_score_records(self):
+        records = list(tp.score_records(tp.parse_lines(TOUR), local_rules=False))
+
+        self.assertEqual(records[1], tp.PlayerResult('Алексей', '35612/----2/8-6/3/4/', 98, be.ERR_OK))
+        self.assertEqual(records[3], tp.TourEnd(1))
+
+    def test_score_many_once_per_tour(self):
+        lines = TOUR[:3] + ['Павел\t1X3-5/X8154-57/XX\n'] + TOUR[3:]
+        expected = list(tp.score_records(tp.parse_lines(lines * 3), local_rules=False, scorer=tp.bowling_score))
+
+        with patch.object(be, 'score_many', wraps=be.score_many) as score_many:
+            records = list(tp.score_records(tp.parse_lines(lines * 3), local_rules=False))
+            block = tp.score_block(lines * 3, local_rules=False)
+
+        self.assertEqual(records, expected)
+        self.assertEqual(block, expected)
+        self.assertEqual(score_many.call_count, 6)
+
+    def test_aggregate_tours(self):
+        standings = tp.Standings()
+        records = list(tp.aggregate_tours(tp.score_records(tp.parse_lines(TOUR * 2)), standings))
+
+        self.assertEqual(records[-1], tp.TourWinner(2, 'Татьяна'))
+        self.assertEqual(standings.tours, 2)
+        self.assertEqual(standings.player_played, {'Татьяна': 2, 'Алексей': 2})
+        self.assertEqual(standings.player_winner, {'Татьяна': 2, 'Алексей': 0})
+
+    def test_standings(self):
+        standings = tp.Standings()
+
+        standings.add_result('Алексей', 'X', 100)
+        standings.add_result('Павел', 'X', 120)
+        standings.add_result('Давид', 'X', 120)
+        self.assertEqual(standings.finish_tour(), 'Павел')
+        standings.add_result('Алексей', 'X', 90)
+        self.assertEqual(standings.finish_tour(), 'Алексей')
+        self.assertIsNone(standings.finish_tour())
+
+        self.assertEqual(standings.standing('Алексей'), (2, 1, 190, 100))
+        self.assertEqual(standings.standing('Павел'), (1, 1, 120, 120))
+        self.assertEqual(standings.standing('Давид'), (1, 0, 120, 120))
+        self.assertEqual(standings.tour_results, {})
+
+    def test_add_and_remove_tour(self):
+        standings = tp.Standings()
+
+        standings.add_tour([('Алексей', 100), ('Павел', 120)], 'Павел')
+        standings.add_tour([('Алексей', 90)], 'Алексей')
+        standings.remove_tour([('Алексей', 100), ('Павел', 120)], 'Павел')
+
+        self.assertEqual(standings.standing('Алексей'), (1, 1, 90, 100))
+        self.assertNotIn('Павел', standings.player_played)
+        self.assertNotIn('Павел', standings.player_best)
+
+    def test_results_of_previous_tour_are_not_used(self):
+        lines = ['### Tour 1\n', 'Павел\tXXXXXXXXXX\n', 'winner\n',
+                 '### Tour 2\n', 'Алексей\t35612/----2/8-6/3/4/\n', 'winner\n']
+
+        rows = list(tp.process(lines, tp.Standings()))
+
+        self.assertEqual(rows[-1], 'winner is Алексей\n')
+
+    def test_tour_without_winner_line(self):
+        lines = ['Давид\tXXXXXXXXXX\n', '### Tour 1\n', 'Алексей\tXXXXXXXXXX\n',
+                 '### Tour 2\n', 'Павел\t1/X3-5/X8154-57/X\n', 'winner is\n']
+        standings = tp.Standings()
+
+        rows = list(tp.process(lines, standings))
+
+        self.assertEqual(rows[-1], 'winner is Павел\n')
+        self.assertEqual(standings.player_winner, {'Давид': 0, 'Алексей': 0, 'Павел': 1})
+
+    def test_reject_invalid(self):
+        lines = TOUR[:2] + ['Павел\t1X3-5/X8154-57/XX\n'] + TOUR[2:]
+        sink = io.StringIO()
+        rejects = tp.Rejects(sink)
+        standings = tp.Standings()
+
+        rows = list(tp.process(lines, standings, rejects=rejects))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rejects.count, 1)
+        self.assertEqual(sink.getvalue(), "Павел 1X3-5/X8154-57/XX Second throw can't be strike (throw 2)\n")
+        self.assertNotIn('Павел', standings.player_played)
+
+    def test_write_rows_to_sink(self):
+        sink = io.StringIO()
+
+        written = tp.write_rows(tp.process(TOUR, tp.Standings(), local_rules=False), sink)
+
+        self.assertEqual(written, 4)
+        self.assertEqual(sink.getvalue(), '### Tour 1\n'
+                                          'Алексей 35612/----2/8-6/3/4/ 98\n'
+                                          'Татьяна 62334/6/4/44X361/X 134\n'
+                                          'winner is Татьяна\n')
+
+    def test_streaming(self):
+        endless_file = itertools.cycle(TOUR)
+
+        rows = list(itertools.islice(tp.process(endless_file, tp.Standings()), 10))
+
+        self.assertEqual(rows[4], '### Tour 2\n')
+
+    def test_split_tours(self):
+        blocks = list(tp.split_tours(['header\n'] + TOUR * 3, tours_per_block=2))
+
+        self.assertEqual([len(block) for block in blocks], [1, 10, 5])
+        self.assertTrue(blocks[1][0].startswith('### Tour'))
+
+    def test_parallel_records(self):
+        lines = ['Павел\t----15623113-95/7/26\n', 'winner\n'] + TOUR * 5
+        expected = list(tp.score_records(tp.parse_lines(lines, 3), local_rules=False))
+
+        records = list(tp.parallel_records(lines, local_rules=False, tour_counter=3, workers=2, tours_per_block=2))
+
+        self.assertEqual(records, expected)
+
+    def test_threaded_process(self):
+        lines = TOUR * 500
+        standings = tp.Standings()
+        expected = list(tp.process(lines, standings, local_rules=False))
+
+        for threads in (2, 8):
+            threaded_standings = tp.Standings()
+            rows = list(tp.process(lines, threaded_standings, local_rules=False, threads=threads))
+
+            self.assertEqual(rows, expected)
+            self.assertEqual(threaded_standings.player_points, standings.player_points)
+            self.assertEqual(threaded_standings.player_winner, standings.player_winner)
+
+
+if __name__ == '__main__':
+    unittest.main()
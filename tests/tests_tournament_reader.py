@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import tournament_pipeline as tp
+import tournament_reader as tr
+from helpers import TOURNAMENT_FILE
+
+
+class TournamentReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(TOURNAMENT_FILE, encoding='UTF8') as file:
+            self.lines = file.readlines()
+        with open(TOURNAMENT_FILE, 'rb') as file:
+            self.data = file.read()
+
+    def test_parse_block(self):
+        self.assertEqual(list(tr.parse_block(self.data, tour_counter=2)), list(tp.parse_lines(self.lines, 2)))
+
+    def test_block_offsets(self):
+        offsets = list(tr.block_offsets(b'header\n' + self.data, tours_per_block=4))
+
+        self.assertEqual([start for start, end in offsets], [0, 7, 7 + self.data.index(b'### Tour 5')])
+        self.assertEqual(offsets[-1][1], len(self.data) + 7)
+
+    def test_mapped_blocks(self):
+        blocks = [bytes(block) for block in tr.mapped_blocks(TOURNAMENT_FILE, tours_per_block=2)]
+
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual(b''.join(blocks), self.data)
+        self.assertTrue(all(block.startswith(tr.TOUR_HEADER) for block in blocks))
+
+    def test_mapped_records(self):
+        expected = list(tp.score_records(tp.parse_lines(self.lines), local_rules=False))
+
+        self.assertEqual(list(tr.mapped_records(TOURNAMENT_FILE, local_rules=False)), expected)
+        self.assertEqual(list(tr.mapped_records(TOURNAMENT_FILE, local_rules=False, workers=2, tours_per_block=1)),
+                         expected)
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'empty.txt')
+            open(path, 'w').close()
+
+            self.assertEqual(list(tr.mapped_records(path)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
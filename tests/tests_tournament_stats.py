@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import shutil
+import unittest
+
+import bowling_engine as be
+import helpers
+import tournament_batch as tbatch
+import tournament_pipeline as tp
+import tournament_stats as ts
+from helpers import TOURNAMENT_FILE
+
+
+class TournamentStatsTest(helpers.TournamentTestCase):
+
+    options = {'local_rules': False, 'collect_stats': True}
+
+    def test_records(self):
+        stats = ts.TournamentStats()
+        records = [tp.TourStart(1), tp.PlayerResult('Алексей', 'XXXXXXXXXX', 300, 0),
+                   tp.PlayerResult('Павел', '5/5/5/5/5/5/5/5/5/5-', 150, 0), tp.TourWinner(1, 'Алексей'),
+                   tp.TourStart(2), tp.PlayerResult('Павел', '1-1-1-1-1-1-1-1-1-1-', 10, 0), tp.TourWinner(2, 'Павел')]
+
+        self.assertEqual(list(stats.records(records)), records)
+        self.assertEqual(stats.player_stats('Алексей'), {'name': 'Алексей', 'games': 1, 'wins': 1, 'average': 300.0,
+                                                         'best': 300, 'strike_rate': 1.0, 'spare_rate': 0.0})
+        self.assertEqual(stats.player_stats('Павел'), {'name': 'Павел', 'games': 2, 'wins': 1, 'average': 80.0,
+                                                       'best': 150, 'strike_rate': 0.0, 'spare_rate': 0.45})
+        self.assertEqual(stats.tour_stats(1), {'number': 1, 'games': 2, 'average': 225.0, 'min': 150, 'max': 300,
+                                               'stdev': 75.0})
+        self.assertEqual(stats.tour_stats(2)['games'], 1)
+        self.assertEqual(stats.percentile(0.5), 150)
+        with self.assertRaises(IndexError):
+            stats.tour_stats(3)
+
+    def test_same_as_throws(self):
+        tournament = self.analyze('result')
+        stats = tournament.stats
+
+        self.assertEqual(len(list(stats.tour_rows())), tournament.tour_counter)
+        for name in tournament.player_played:
+            player = stats.players[name]
+            self.assertEqual(stats.games[player], tournament.player_played[name])
+            self.assertEqual(stats.wins[player], tournament.player_winner[name])
+            self.assertEqual(stats.points[player], tournament.standings.player_points[name])
+            self.assertEqual(stats.best[player], tournament.standings.player_best[name])
+
+        strikes = spares = chances = 0
+        with open(TOURNAMENT_FILE, encoding='UTF8') as file:
+            for record in tp.parse_lines(file):
+                if type(record) is tp.PlayerResult and be.validate(record.result, local_rules=False) == be.VALID:
+                    frames = be.frame_tokens(record.result)
+                    strikes += frames.count('X') + frames.count('x')
+                    spares += sum(frame.endswith('/') for frame in frames)
+                    chances += sum(len(frame) == 2 for frame in frames)
+        self.assertEqual((sum(stats.strikes), sum(stats.spares), sum(stats.spare_chances)), (strikes, spares, chances))
+
+    def test_same_stats_for_every_mode(self):
+        expected = self.analyze('plain').stats.to_dict()
+
+        self.assertEqual(self.analyze('mapped', memory_map=True).stats.to_dict(), expected)
+        self.assertEqual(self.analyze('incremental', incremental=True).stats.to_dict(), expected)
+        self.assertEqual(self.analyze('binary', binary_file=self.path('result.bin')).stats.to_dict(),
+                         expected)
+
+    def test_merge(self):
+        stats = self.analyze('result').stats
+        merged = ts.TournamentStats()
+        merged.merge(stats)
+        merged.merge(pickle.loads(pickle.dumps(stats)))
+
+        self.assertEqual(len(list(merged.tour_rows())), 12)
+        self.assertEqual(list(merged.games), [2 * games for games in stats.games])
+        self.assertEqual(merged.player_stats('Павел')['average'], stats.player_stats('Павел')['average'])
+        self.assertEqual(merged.tour_stats(7), dict(stats.tour_stats(1), number=7))
+
+    def test_batch(self):
+        input_dir = self.path('leagues')
+        os.mkdir(input_dir)
+        for name in ('first', 'second'):
+            shutil.copy(TOURNAMENT_FILE, os.path.join(input_dir, f'{name}.txt'))
+
+        summaries = list(tbatch.run_batch(tbatch.find_inputs([input_dir]), self.path('results'),
+                                          local_rules=False, collect_stats=True))
+        stats = tbatch.merge_stats(summaries)
+
+        self.assertEqual(list(stats.games), [2 * games for games in summaries[0].stats.games])
+        self.assertIn('Татьяна', ''.join(stats.table_rows()))
+        self.assertIsNone(tbatch.merge_stats([summary._replace(stats=None) for summary in summaries]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import bowling_tournament as bt
+import tournament_pipeline as tp
+import tournament_table as tt
+from helpers import TOURNAMENT_FILE
+
+
+def league(players=3000, seed=3):
+    """ Standings with many players and many ties"""
+    rnd = random.Random(seed)
+    standings = tp.Standings()
+    for player in range(players):
+        name = f'player{player}'
+        for _ in range(rnd.randint(1, 5)):
+            standings.add_result(name, '', rnd.randint(0, 30) * 10)
+            if rnd.random() < 0.3:
+                standings.finish_tour()
+        standings.finish_tour()
+    return standings
+
+
+class CountingStream(io.StringIO):
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TournamentTableTest(unittest.TestCase):
+
+    def test_top_is_the_same_as_full_sort(self):
+        standings = league()
+        for sort_by in tt.SORT_KEYS:
+            with self.subTest(sort_by=sort_by):
+                everyone = tt.ranked_rows(standings, sort_by=sort_by)
+                self.assertEqual(len(everyone), len(standings.player_played))
+                self.assertEqual(tt.ranked_rows(standings, sort_by=sort_by, top=50), everyone[:50])
+                self.assertEqual(tt.ranked_rows(standings, sort_by=sort_by, page=3, page_size=40), everyone[80:120])
+                self.assertEqual(tt.ranked_rows(standings, sort_by=sort_by, top=100, page=3, page_size=40),
+                                 everyone[80:100])
+
+    def test_sort_keys(self):
+        standings = league()
+        rows = tt.ranked_rows(standings, sort_by='points')
+        self.assertEqual([row.rank for row in rows[:3]], [1, 2, 3])
+        self.assertEqual([(row.points, row.wins) for row in rows],
+                         sorted(((row.points, row.wins) for row in rows), reverse=True))
+        rows = tt.ranked_rows(standings, sort_by='games')
+        self.assertEqual([row.played for row in rows], sorted((row.played for row in rows), reverse=True))
+        rows = tt.ranked_rows(standings, sort_by=None, page=2, page_size=2)
+        self.assertEqual([row.name for row in rows], ['player2', 'player3'])
+
+    def test_pages(self):
+        standings = league(players=10)
+
+        self.assertEqual(tt.ranked_rows(standings, page=4, page_size=5), [])
+        for arguments in ({'page': 0}, {'page_size': 0}, {'top': -1}, {'sort_by': 'best'}):
+            with self.subTest(arguments=arguments), self.assertRaises(ValueError):
+                tt.ranked_rows(standings, **arguments)
+
+    def test_formats(self):
+        standings = tp.Standings()
+        standings.add_result('Алексей', '', 150)
+        standings.add_result('Игрок с очень длинным именем', '', 90)
+        standings.finish_tour()
+        rows = tt.ranked_rows(standings)
+
+        lines = tt.render(rows).splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(len({len(line) for line in lines}), 1)
+        self.assertEqual(list(csv.reader(io.StringIO(tt.render(rows, 'csv')))),
+                         [list(tt.Row._fields), ['1', 'Алексей', '1', '1', '150', '150'],
+                          ['2', 'Игрок с очень длинным именем', '1', '0', '90', '90']])
+        self.assertEqual(json.loads(tt.render(rows, 'json'))[0], {'rank': 1, 'name': 'Алексей', 'played': 1,
+                                                                  'wins': 1, 'points': 150, 'best': 150})
+        with self.assertRaises(ValueError):
+            tt.render(rows, 'xml')
+
+    def test_one_write(self):
+        stream = CountingStream()
+
+        self.assertEqual(tt.write_table(league(), stream, page_size=1000), 1000)
+        self.assertEqual(stream.writes, 1)
+        self.assertEqual(stream.getvalue().count('\n'), 1004)
+
+    def test_tournament_table(self):
+        output = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            tournament = bt.BowlingTournament(TOURNAMENT_FILE, os.path.join(tmp, 'result.txt'), make_table=True,
+                                              local_rules=False)
+            with redirect_stdout(output):
+                tournament.analyze_input_file()
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3 + len(tournament.player_played) + 1)
+        self.assertIn('Татьяна', lines[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Batch processing of many tournament files in one run. Files are analyzed by worker processes, each one
+to its own report, standings of all files are joined into one table.
+"""
+import glob
+import os
+from collections import namedtuple
+
+import bowling_cache as bc
+import bowling_tournament as bt
+import tournament_pipeline as tp
+
+FileSummary = namedtuple('FileSummary', 'input_file output_file tours games rejected standings error stats',
+                         defaults=(None,))
+
+
+def find_inputs(patterns, extension='.txt'):
+    """
+    Tournament files of directories and glob patterns
+    :param patterns: directories (all files with extension are taken) or glob patterns
+    :return: list of files, each file once, sorted inside every pattern
+    """
+    files = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(glob.escape(pattern), f'*{extension}'))
+        else:
+            matches = glob.glob(pattern)
+        for match in sorted(matches):
+            if os.path.isfile(match):
+                files.setdefault(os.path.normpath(match))
+    return list(files)
+
+
+def output_path(input_file, output_dir, suffix='_result'):
+    """ Report file of input_file in output_dir: tournament.txt -> tournament_result.txt"""
+    stem, extension = os.path.splitext(os.path.basename(input_file))
+    return os.path.join(output_dir, f'{stem}{suffix}{extension or ".txt"}')
+
+
+def analyze_file(input_file, output_file, options):
+    """
+    Worker task: analyze one tournament file
+    :param options: other BowlingTournament arguments, cache_file - SQLite score cache opened by this worker,
+        report is overwritten unless overwrite=False is given
+    :return: FileSummary, file that can't be read or parsed gets error message instead of standings,
+        stats are given if collect_stats option is set
+    """
+    options = dict(options)
+    options.setdefault('overwrite', True)
+    cache_file = options.pop('cache_file', None)
+    try:
+        if cache_file:
+            options['score_cache'] = bc.DiskScoreCache(cache_file)
+        try:
+            tournament = bt.BowlingTournament(input_file, output_file, **options)
+            tournament.analyze_input_file()
+        finally:
+            if cache_file and 'score_cache' in options:
+                options['score_cache'].close()
+    except (OSError, ValueError, IndexError, bc.sqlite3.Error) as exc:
+        return FileSummary(input_file, output_file, 0, 0, 0, None, f'{type(exc).__name__}: {exc}')
+    rejected = tournament.rejects.count
+    games = sum(tournament.player_played.values()) + rejected
+    return FileSummary(input_file, output_file, tournament.tour_counter, games, rejected, tournament.standings, None,
+                       tournament.stats)
+
+
+def run_batch(input_files, output_dir, workers=1, **options):
+    """
+    Analyze tournament files, reports are written to output_dir
+    :param input_files: list of tournament files, see find_inputs
+    :param output_dir: directory for reports, it is made if it doesn't exist
+    :param workers: amount of worker processes, 1 - files are analyzed one by one in this process
+    :param options: other BowlingTournament arguments, e.g. local_rules, and cache_file, see analyze_file
+    :return: generator of FileSummary in the order of input_files
+    """
+    output_files = [output_path(input_file, output_dir) for input_file in input_files]
+    if len(set(output_files)) != len(output_files):
+        raise ValueError('Input files with the same name would be written to the same report')
+    if set(map(os.path.abspath, output_files)) & set(map(os.path.abspath, input_files)):
+        raise ValueError('Report would be written over an input file')
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = ((input_file, output_file, options) for input_file, output_file in zip(input_files, output_files))
+    if workers > 1:
+        return tp.ordered_map(analyze_file, tasks, workers)
+    return (analyze_file(*task) for task in tasks)
+
+
+def merge_standings(summaries):
+    """ Standings of all files that were analyzed without errors"""
+    standings = tp.Standings()
+    for summary in summaries:
+        if summary.standings is not None:
+            standings.merge(summary.standings)
+    return standings
+
+
+def merge_stats(summaries):
+    """ Statistics of all files that were analyzed without errors, None if they were not collected"""
+    merged = None
+    for summary in summaries:
+        if summary.stats is not None:
+            if merged is None:
+                merged = type(summary.stats)()
+            merged.merge(summary.stats)
+    return merged
+
+
+def summary_rows(summaries):
+    """ Table lines with one row per file"""
+    line = f'+{"-" * 30}+{"-" * 8}+{"-" * 8}+{"-" * 10}+{"-" * 30}+\n'
+    yield line
+    yield f'|{"File":^30}|{"Tours":^8}|{"Games":^8}|{"Rejected":^10}|{"Report":^30}|\n'
+    yield line
+    for summary in summaries:
+        name = os.path.basename(summary.input_file)
+        if summary.error is not None:
+            yield f'|{name:^30}|{summary.error[:59]:^59}|\n'
+        else:
+            yield (f'|{name:^30}|{summary.tours:^8}|{summary.games:^8}|{summary.rejected:^10}|'
+                   f'{os.path.basename(summary.output_file):^30}|\n')
+    yield line
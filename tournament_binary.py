@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar binary format for scored tournaments, read back through mmap without parsing report lines.
+
+Little-endian file: header, table of sections (offset, size), then sections aligned to 8 bytes:
+    name offsets   uint32 x (players + 1)    player names, UTF-8 blob
+    tour offsets   uint32 x (tours + 1)      first result of every tour, the last item is amount of results
+    tour winners   uint32 x tours            player index, NO_WINNER if there were no results
+    result players uint32 x results          player index of every result
+    result points  uint16 x results
+    game offsets   uint32 x (results + 1)    game results, ASCII blob
+    player offsets uint32 x (players + 1)    where results of every player start in player results
+    player results uint32 x results          result indexes grouped by player, in file order
+"""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+import tournament_pipeline as tp
+
+MAGIC = b'BWLT'
+FORMAT_VERSION = 1
+NO_WINNER = 0xFFFFFFFF
+_HEADER = struct.Struct('<4sHHIIII')
+_SECTIONS = 10
+_TABLE = struct.Struct(f'<{2 * _SECTIONS}Q')
+(_NAME_OFFSETS, _NAMES, _TOUR_OFFSETS, _TOUR_WINNERS, _RESULT_PLAYERS, _RESULT_POINTS, _GAME_OFFSETS, _GAMES,
+ _PLAYER_OFFSETS, _PLAYER_RESULTS) = range(_SECTIONS)
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+TourRecord = namedtuple('TourRecord', 'number results winner')
+GameRecord = namedtuple('GameRecord', 'tour name result points')
+
+
+class BinaryWriter:
+    """
+    Collects scored records into compact columns and writes the file on close().
+    Records are the ones tournament_pipeline.aggregate_tours gives: TourStart, PlayerResult, TourWinner.
+    """
+
+    def __init__(self, output_file):
+        """
+        :param output_file: file where to write binary results, it is replaced
+        """
+        self.output_file = output_file
+        self.first_tour = None
+        self._players = {}
+        self._names = []
+        self._tour_offsets = array('I')
+        self._tour_winners = array('I')
+        self._result_players = array('I')
+        self._result_points = array('H')
+        self._game_offsets = array('I', [0])
+        self._games = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+    def _player(self, name):
+        index = self._players.get(name)
+        if index is None:
+            index = self._players[name] = len(self._names)
+            self._names.append(name)
+        return index
+
+    def add(self, record):
+        """ Add one record, other record types are skipped"""
+        if type(record) is tp.PlayerResult:
+            self._result_players.append(self._player(record.name))
+            self._result_points.append(record.points)
+            self._games += record.result.encode('UTF8')
+            self._game_offsets.append(len(self._games))
+        elif type(record) is tp.TourStart:
+            if self.first_tour is None:
+                self.first_tour = record.number
+            self._tour_offsets.append(len(self._result_players))
+            self._tour_winners.append(NO_WINNER)
+        elif type(record) is tp.TourWinner and record.name is not None and self._tour_winners:
+            self._tour_winners[-1] = self._player(record.name)
+
+    def records(self, records):
+        """ Pass records through as they are, adding every one of them"""
+        for record in records:
+            self.add(record)
+            yield record
+
+    def close(self):
+        names = array('I', [0])
+        blob = bytearray()
+        for name in self._names:
+            blob += name.encode('UTF8')
+            names.append(len(blob))
+        tour_offsets = array('I', self._tour_offsets)
+        tour_offsets.append(len(self._result_players))
+        player_offsets, player_results = self._player_index()
+        sections = [names, blob, tour_offsets, self._tour_winners, self._result_players, self._result_points,
+                    self._game_offsets, self._games, player_offsets, player_results]
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self._names), len(self._tour_winners),
+                              len(self._result_players), self.first_tour or 1)
+        table = []
+        position = _aligned(_HEADER.size + _TABLE.size)
+        for section in sections:
+            size = len(section) * getattr(section, 'itemsize', 1)
+            table += [position, size]
+            position = _aligned(position + size)
+        with open(self.output_file, 'wb') as file:
+            file.write(header)
+            file.write(_TABLE.pack(*table))
+            for index, section in enumerate(sections):
+                file.write(bytes(table[2 * index] - file.tell()))
+                if isinstance(section, array) and not _LITTLE_ENDIAN:
+                    section = array(section.typecode, section)
+                    section.byteswap()
+                file.write(section)
+
+    def _player_index(self):
+        """ Result indexes grouped by player (counting sort), offsets of every player group"""
+        offsets = array('I', bytes(4 * (len(self._names) + 1)))
+        for player in self._result_players:
+            offsets[player + 1] += 1
+        for index in range(len(self._names)):
+            offsets[index + 1] += offsets[index]
+        results = array('I', bytes(4 * len(self._result_players)))
+        fill = array('I', offsets)
+        for index, player in enumerate(self._result_players):
+            results[fill[player]] = index
+            fill[player] += 1
+        return offsets, results
+
+
+def _aligned(position):
+    return (position + 7) & ~7
+
+
+class BinaryReport:
+    """
+    Memory-mapped reader of BinaryWriter files with random access by tour and by player.
+    Columns are memoryviews over the mapping, nothing is read until it is used.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mapping)
+        magic, version, _, self.players, self.tours, self.results, self.first_tour = _HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a binary tournament file of version {FORMAT_VERSION}')
+        self._table = _TABLE.unpack_from(self._view, _HEADER.size)
+        self.name_offsets = self._column(_NAME_OFFSETS, 'I')
+        self.tour_offsets = self._column(_TOUR_OFFSETS, 'I')
+        self.tour_winners = self._column(_TOUR_WINNERS, 'I')
+        self.result_players = self._column(_RESULT_PLAYERS, 'I')
+        self.result_points = self._column(_RESULT_POINTS, 'H')
+        self.game_offsets = self._column(_GAME_OFFSETS, 'I')
+        self.player_offsets = self._column(_PLAYER_OFFSETS, 'I')
+        self.player_results = self._column(_PLAYER_RESULTS, 'I')
+        self._player_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _section(self, index):
+        offset, size = self._table[2 * index], self._table[2 * index + 1]
+        return self._view[offset:offset + size]
+
+    def _column(self, index, typecode):
+        section = self._section(index)
+        if _LITTLE_ENDIAN:
+            return section.cast(typecode)
+        column = array(typecode, section.tobytes())
+        column.byteswap()
+        return column
+
+    def close(self):
+        for name in ('name_offsets', 'tour_offsets', 'tour_winners', 'result_players', 'result_points',
+                     'game_offsets', 'player_offsets', 'player_results'):
+            column = getattr(self, name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self._view.release()
+        self._mapping.close()
+
+    def name(self, player):
+        """ Player name by index"""
+        start, end = self.name_offsets[player], self.name_offsets[player + 1]
+        return self._section(_NAMES)[start:end].tobytes().decode('UTF8')
+
+    def player(self, name):
+        """ Player index by name, KeyError if there is no such player"""
+        if self._player_index is None:
+            self._player_index = {self.name(player): player for player in range(self.players)}
+        return self._player_index[name]
+
+    def game(self, index):
+        """ Game result string of result index"""
+        start, end = self.game_offsets[index], self.game_offsets[index + 1]
+        return self._section(_GAMES)[start:end].tobytes().decode('UTF8')
+
+    def tour_of(self, index):
+        """ Tour number of result index, None for results before the first tour"""
+        position = bisect_right(self.tour_offsets, index, 0, self.tours) - 1
+        return None if position < 0 else self.first_tour + position
+
+    def tour(self, number):
+        """
+        Results of one tour
+        :param number: tour number as it is in the report
+        :return: TourRecord(number, list of (name, result, points), winner name or None)
+        """
+        position = number - self.first_tour
+        if not 0 <= position < self.tours:
+            raise IndexError(f'There is no tour {number}')
+        results = [(self.name(self.result_players[index]), self.game(index), self.result_points[index])
+                   for index in range(self.tour_offsets[position], self.tour_offsets[position + 1])]
+        winner = self.tour_winners[position]
+        return TourRecord(number, results, None if winner == NO_WINNER else self.name(winner))
+
+    def player_games(self, name):
+        """ All games of the player in file order: list of GameRecord"""
+        player = self.player(name)
+        return [GameRecord(self.tour_of(index), name, self.game(index), self.result_points[index])
+                for index in self.player_results[self.player_offsets[player]:self.player_offsets[player + 1]]]
+
+    def wins(self, name):
+        """ How many tours the player won"""
+        player = self.player(name)
+        return sum(1 for winner in self.tour_winners if winner == player)
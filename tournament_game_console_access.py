@@ -1,6 +1,6 @@
-import argparse
-import bowling_tournament as bt
 """ Console script for bowling_tournament.py module """
+import argparse
+# scoring modules are imported in main() after arguments are parsed, only the ones the chosen mode needs
 
 
 def str_to_bool(string):  # не понимаю, почему передача type=bool не работает в аргументе
@@ -19,24 +19,140 @@ def str_to_bool(string):  # не понимаю, почему передача t
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
 
-tournament_parser = argparse.ArgumentParser("Script for analyzing tournament results. "
-                                            "Enter input file with player's results and output file where to write"
-                                            "the competition's results")
+def make_parser():
+    tournament_parser = argparse.ArgumentParser("Script for analyzing tournament results. "
+                                                "Enter input file with player's results and output file "
+                                                "where to write the competition's results")
+
+    input_group = tournament_parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument('-i', '--input_file', help='Full path to file needed to be analyzed')
+    input_group.add_argument('-d', '--inputs', nargs='+',
+                             help='Batch mode: directories (all .txt files) or glob patterns of files '
+                                  'needed to be analyzed')
+    tournament_parser.add_argument('-o', '--output_file', help='Full path to file where to write results')
+    tournament_parser.add_argument('-r', '--reject_file',
+                                   help='Full path to file where to write incorrect results, '
+                                        'they are not put into the report')
+    tournament_parser.add_argument('--output_dir', help='Batch mode: directory where to write results of every file')
+    tournament_parser.add_argument('-w', '--workers', type=int, default=1,
+                                   help='Amount of worker processes: files in batch mode, tours otherwise')
+    tournament_parser.add_argument('-t', '--threads', type=int, default=1,
+                                   help='Amount of threads for scoring tours while the file is read and written')
+    tournament_parser.add_argument('-m', '--make_table', type=str_to_bool, default=False,
+                                   help='Choose True or False. Need to print tournament table or not')
+    tournament_parser.add_argument('--sort', default='wins', choices=('wins', 'games', 'points'),
+                                   help='Sort tournament table by victories, games played or points')
+    tournament_parser.add_argument('--top', type=int, help='Show only this many best players in tournament table')
+    tournament_parser.add_argument('--page', type=int, default=1, help='Page of tournament table, from 1')
+    tournament_parser.add_argument('--page_size', type=int, help='Players on a page of tournament table')
+    tournament_parser.add_argument('--table_format', default='ascii', choices=('ascii', 'csv', 'json'),
+                                   help='Tournament table as ASCII table, CSV or JSON')
+    tournament_parser.add_argument('-l', '--local_rules', type=str_to_bool, default=False,
+                                   help='Choose rules for counting game result:'
+                                        'pick True if you want to use local,'
+                                        'pick False for tournament rules')
+    tournament_parser.add_argument('--use_bowling', action='store_true',
+                                   help='Count points with bowling.Bowling instead of the scoring engine, slower')
+    tournament_parser.add_argument('-c', '--cache_file',
+                                   help='SQLite file where game points are kept between runs, '
+                                        'made if it does not exist')
+    tournament_parser.add_argument('-n', '--incremental', action='store_true',
+                                   help='Score again only tours that changed since the last run, '
+                                        'output file is rewritten instead of appended to')
+    tournament_parser.add_argument('-b', '--binary_file',
+                                   help='Full path to file where to write results in columnar binary format too')
+    tournament_parser.add_argument('-s', '--stats', action='store_true',
+                                   help='Print strike and spare rates, average and best game of every player')
+    tournament_parser.add_argument('-p', '--profile', action='store_true',
+                                   help='Print time of processing stages and counters to stderr')
+    return tournament_parser
+
+
+def main(argv=None):
+    """
+    Analyze one tournament file or, in batch mode, many of them
+    :param argv: command line arguments, sys.argv by default
+    """
+    tournament_parser = make_parser()
+    tournament_files = vars(tournament_parser.parse_args(argv))
+    profile = tournament_files.pop('profile')
+    cache_file = tournament_files.pop('cache_file')
+    inputs = tournament_files.pop('inputs')
+    output_dir = tournament_files.pop('output_dir')
+    tournament_files['collect_stats'] = tournament_files.pop('stats')
+    table_options = {'sort_by': tournament_files.pop('sort'), 'top': tournament_files.pop('top'),
+                     'page': tournament_files.pop('page'), 'page_size': tournament_files.pop('page_size'),
+                     'output_format': tournament_files.pop('table_format')}
+    make_table = tournament_files.pop('make_table')
+    if table_options['page'] < 1 or (table_options['page_size'] or 1) < 1 or (table_options['top'] or 0) < 0:
+        tournament_parser.error('--page and --page_size should be positive, --top should not be negative')
+    if inputs and (not output_dir or tournament_files['binary_file'] or tournament_files['output_file']
+                   or tournament_files['reject_file']):
+        tournament_parser.error('batch mode needs --output_dir and takes no --output_file, --binary_file '
+                                'and --reject_file')
+    if cache_file and (tournament_files['threads'] > 1 or (not inputs and tournament_files['workers'] > 1)):
+        tournament_parser.error('--cache_file is not used by threads and by worker processes of one file')
+    if tournament_files['output_file'] is None:
+        del tournament_files['output_file']
+
+    import bowling_metrics as bm
+    if profile:
+        bm.enable([bm.text_exporter()])
+    if inputs:
+        import tournament_batch as tbatch
+        input_files = tbatch.find_inputs(inputs)
+        summaries = list(tbatch.run_batch(input_files, output_dir, workers=tournament_files['workers'],
+                                          local_rules=tournament_files['local_rules'],
+                                          incremental=tournament_files['incremental'], cache_file=cache_file,
+                                          threads=tournament_files['threads'],
+                                          collect_stats=tournament_files['collect_stats'],
+                                          use_bowling=tournament_files['use_bowling']))
+        print(''.join(tbatch.summary_rows(summaries)), end='')
+        import tournament_table as tt
+        tt.write_table(tbatch.merge_standings(summaries), **table_options)
+        stats = tbatch.merge_stats(summaries)
+        if stats is not None:
+            print(''.join(stats.table_rows()), end='')
+        bm.disable()
+        print(f'Saved {len(summaries)} reports at {output_dir}')
+        return summaries
+
+    import bowling_tournament as bt
+    if cache_file:
+        import bowling_cache as bc
+        tournament_files['score_cache'] = bc.DiskScoreCache(cache_file)
+    tournament_checker = bt.BowlingTournament(**tournament_files)
+    try:
+        tournament_checker.analyze_input_file()
+    finally:
+        if cache_file:
+            tournament_files['score_cache'].close()
+    bm.disable()
+    if make_table:
+        tournament_checker.tournament_table(**table_options)
+    if tournament_checker.stats is not None:
+        print(''.join(tournament_checker.stats.table_rows()), end='')
+    rejected = f'{tournament_checker.rejects.count} results rejected'
+    if tournament_checker.reject_file:
+        rejected += f' to {tournament_checker.reject_file}'
+    print(f'Saved at {tournament_checker.output_file}, {rejected}')
+    return tournament_checker
 
-tournament_parser.add_argument('-i', '--input_file', required=True, help='Full path to file needed to be analyzed')
-tournament_parser.add_argument('-o', '--output_file', help='Full path to file where to write results')
-tournament_parser.add_argument('-m', '--make_table', type=str_to_bool, help='Choose True or False. Need to print'
-                                                                            'tournament table or not')
-tournament_parser.add_argument('-l', '--local_rules', type=str_to_bool,
-                               help='Choose rules for counting game result:'
-                                    'pick True if you want to use local,'
-                                    'pick False for tournament rules')
 
-tournament_files = vars(tournament_parser.parse_args())
-tournament_checker = bt.BowlingTournament(**tournament_files)
-tournament_checker.analyze_input_file()
-print(f"Saved at {tournament_files['output_file']}")
+if __name__ == '__main__':
+    main()
 
 # input example
 # python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt
 # python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -m false -l false
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt --profile
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -c scores.db
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt --incremental
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -b tournament_result.bin
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -t 4
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -r tournament_rejects.txt
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt --stats
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -m true --sort points --top 3
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -m true --page 2 --page_size 2
+# python3 tournament_game_console_access.py -i tournament.txt -o tournament_result.txt -m true --table_format csv
+# python3 tournament_game_console_access.py -d leagues/ 'archive/*/tour*.txt' --output_dir results -w 4
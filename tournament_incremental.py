@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental processing of tournament files. Every tour block gets a fingerprint, blocks with their report lines
+and results are kept in a manifest next to the report. On the next run only tours that changed are scored again,
+standings are patched with the difference and the report is written anew, the same as a clean run gives.
+"""
+import hashlib
+import io
+import json
+import os
+
+import bowling_engine as be
+import tournament_pipeline as tp
+
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_FORMAT = 1
+
+
+def manifest_path(output_file):
+    return output_file + MANIFEST_SUFFIX
+
+
+def fingerprint(block):
+    """
+    Hash of tour block lines. '### Tour N' header and empty lines are not hashed,
+    so renumbered tours and the last tour of the file without empty line after it stay the same
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for line in block[1:] if has_header(block) else block:
+        line = line.strip()
+        if line:
+            digest.update(line.encode('UTF8'))
+            digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def has_header(block):
+    return bool(block) and block[0].startswith('### Tour')
+
+
+def score_tour(block, local_rules=True, scorer=be.score_game):
+    """
+    Score one tour block
+    :param block: lines of one tour from tournament_pipeline.split_tours
+    :return: manifest entry: report lines without the tour header, reject lines,
+        accepted results as [name, points] and winner name or None
+    """
+    rejected = io.StringIO()
+    records = tp.reject_invalid(tp.score_records(tp.parse_lines(block), local_rules=local_rules, scorer=scorer),
+                                tp.Rejects(rejected, local_rules=local_rules))
+    results = []
+    winner = None
+    rows = []
+    for record in tp.aggregate_tours(records, tp.Standings()):
+        if type(record) is tp.PlayerResult:
+            results.append([record.name, record.points])
+        elif type(record) is tp.TourWinner:
+            winner = record.name
+        elif type(record) is tp.TourStart:
+            continue
+        rows.extend(tp.report_rows([record]))
+    return {'hash': fingerprint(block), 'header': has_header(block), 'rows': rows,
+            'rejects': rejected.getvalue().splitlines(keepends=True), 'results': results, 'winner': winner}
+
+
+def load_manifest(path, local_rules=True):
+    """ Manifest of the previous run, None if there is none or it was made with other rules or engine"""
+    try:
+        with open(path, encoding='UTF8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get('format') != MANIFEST_FORMAT or manifest.get('engine_version') != be.ENGINE_VERSION
+            or manifest.get('local_rules') != local_rules):
+        return None
+    return manifest
+
+
+def save_manifest(path, tours, standings, local_rules=True):
+    manifest = {'format': MANIFEST_FORMAT, 'engine_version': be.ENGINE_VERSION, 'local_rules': local_rules,
+                'tours': tours,
+                'standings': {'player_played': standings.player_played, 'player_winner': standings.player_winner,
+                              'player_points': standings.player_points, 'player_best': standings.player_best}}
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='UTF8') as file:
+        json.dump(manifest, file, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def restore_standings(standings, manifest):
+    """ Put aggregates of the previous run into empty standings"""
+    saved = manifest['standings']
+    for name in saved['player_played']:
+        standings.player_played[name] = saved['player_played'][name]
+        standings.player_winner[name] = saved['player_winner'][name]
+        standings.player_points[name] = saved['player_points'][name]
+        standings.player_best[name] = saved['player_best'][name]
+
+
+def update(blocks, manifest, standings, local_rules=True, scorer=be.score_game):
+    """
+    Match tour blocks with the previous run, score only new ones and patch standings
+    :param blocks: lists of lines of every tour, see tournament_pipeline.split_tours
+    :param manifest: manifest of the previous run or None, standings are restored from it
+    :param standings: empty tournament_pipeline.Standings
+    :return: tuple (manifest entries of all tours in file order, amount of scored tours)
+    """
+    previous = {}
+    known = {}
+    if manifest is not None:
+        restore_standings(standings, manifest)
+        for entry in manifest['tours']:
+            previous.setdefault(entry['hash'], []).append(entry)
+            known[entry['hash']] = entry
+    tours = []
+    added = []
+    scored = 0
+    for block in blocks:
+        digest = fingerprint(block)
+        same = previous.get(digest)
+        if same:
+            tours.append(same.pop())
+            continue
+        if digest in known:
+            # one more copy of a tour that is already counted
+            entry = dict(known[digest])
+        else:
+            entry = score_tour(block, local_rules=local_rules, scorer=scorer)
+            scored += 1
+        tours.append(entry)
+        added.append(entry)
+    removed = [entry for entries in previous.values() for entry in entries]
+    for entry in removed:
+        standings.remove_tour(entry['results'], entry['winner'])
+    for entry in added:
+        standings.add_tour(entry['results'], entry['winner'])
+    if removed:
+        _recount_best(standings, tours, {name for entry in removed for name, _ in entry['results']})
+    if manifest is None or [entry['hash'] for entry in tours] != [entry['hash'] for entry in manifest['tours']]:
+        _reorder(standings, tours)
+    standings.tours = sum(entry['header'] for entry in tours)
+    return tours, scored
+
+
+def _recount_best(standings, tours, names):
+    """ Best game can't be taken back, it is found again for players whose tours were removed"""
+    names = {name for name in names if name in standings.player_played}
+    best = {}
+    for entry in tours:
+        for name, points in entry['results']:
+            if name in names and points > best.get(name, -1):
+                best[name] = points
+    standings.player_best.update(best)
+
+
+def _reorder(standings, tours):
+    """ Players go in order of their first game, as they do after a clean run"""
+    order = {}
+    for entry in tours:
+        for name, _ in entry['results']:
+            order.setdefault(name, len(order))
+    for aggregate in (standings.player_played, standings.player_winner, standings.player_points,
+                      standings.player_best):
+        items = sorted(aggregate.items(), key=lambda item: order[item[0]])
+        aggregate.clear()
+        aggregate.update(items)
+
+
+def report_rows(tours):
+    """ Report lines of all tours, tours are numbered by their place in the file"""
+    number = 0
+    for entry in tours:
+        if entry['header']:
+            number += 1
+            yield f'### Tour {number}\n'
+        yield from entry['rows']
+
+
+def records(tours):
+    """ Records of all tours as aggregate_tours gives them, made from the manifest without scoring"""
+    number = 0
+    for entry in tours:
+        if entry['header']:
+            number += 1
+            yield tp.TourStart(number)
+        for row in entry['rows']:
+            if row.startswith('winner is '):
+                continue
+            name, result, points = row.split()
+            yield tp.PlayerResult(name, result, int(points), be.ERR_OK)
+        if entry['header']:
+            yield tp.TourWinner(number, entry['winner'])
+
+
+def reject_rows(tours):
+    for entry in tours:
+        yield from entry['rejects']
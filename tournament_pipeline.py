@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming processing of tournament files. Each stage is a generator, so files of any size
+are processed line by line:
+    parse_lines -> score_records -> reject_invalid -> aggregate_tours -> report_rows -> sink
+"""
+from collections import deque, namedtuple
+
+import bowling as bw
+import bowling_engine as be
+import bowling_metrics as bm
+
+TourStart = namedtuple('TourStart', 'number')
+PlayerResult = namedtuple('PlayerResult', 'name result points error')
+TourEnd = namedtuple('TourEnd', 'number')
+TourWinner = namedtuple('TourWinner', 'number name')
+
+
+def bowling_score(result, local_rules=True):
+    """
+    Count points with bowling.Bowling
+    :return: tuple (points, error code)
+    """
+    game = bw.Bowling(result, local_rules=local_rules)
+    game.check_result()
+    return game.total_result, game.error
+
+
+def parse_lines(lines, tour_counter=0):
+    """
+    Turn tournament file lines into records: TourStart, PlayerResult without points, TourEnd
+    :param lines: iterable of lines in tournament.txt format
+    :param tour_counter: how many tours were before, tours are numbered after it
+    """
+    for line in lines:
+        if line.startswith('### Tour'):
+            tour_counter += 1
+            yield TourStart(tour_counter)
+            continue
+        if line.startswith('winner'):
+            yield TourEnd(tour_counter)
+            continue
+        line = line.split()
+        if line:
+            yield PlayerResult(line[0], line[1], None, None)
+
+
+def score_records(records, local_rules=True, scorer=be.score_game):
+    """
+    Count points of PlayerResult records, other records are passed as they are.
+    With bowling_engine.score_game results of every tour are kept until the tour ends and are scored
+    with one bowling_engine.score_many call
+    :param records: records from parse_lines
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :param scorer: function (result, local_rules) -> (points, error code)
+    """
+    if scorer is be.score_game:
+        return _score_tours(records, local_rules)
+    return _score_each(records, local_rules, scorer)
+
+
+def _score_each(records, local_rules, scorer):
+    for record in records:
+        if type(record) is PlayerResult:
+            points, error = scorer(record.result, local_rules)
+            record = PlayerResult(record.name, record.result, points, error)
+        yield record
+
+
+def _score_tours(records, local_rules):
+    names = []
+    results = []
+    for record in records:
+        if type(record) is PlayerResult:
+            names.append(record.name)
+            results.append(record.result)
+            continue
+        if results:
+            yield from map(PlayerResult, names, results, *be.score_many(results, local_rules))
+            names = []
+            results = []
+        yield record
+    if results:
+        yield from map(PlayerResult, names, results, *be.score_many(results, local_rules))
+
+
+def timed(name, records):
+    """ Stage timer, records are passed as they are if metrics are not collected"""
+    if bm.ACTIVE is None:
+        return records
+    return bm.ACTIVE.timed(name, records)
+
+
+def count_records(records):
+    """ Count scored games and tours for metrics, records are passed as they are"""
+    metrics = bm.ACTIVE
+    if metrics is None:
+        return records
+    return _counted(records, metrics)
+
+
+def _counted(records, metrics):
+    for record in records:
+        if type(record) is PlayerResult:
+            metrics.count_game(record.result, record.error)
+        elif type(record) is TourStart:
+            metrics.count('tours')
+        yield record
+
+
+def split_tours(lines, tours_per_block=1):
+    """
+    Split tournament file lines into blocks, each block starts with '### Tour' header
+    (lines before the first header make their own block)
+    :param lines: iterable of lines in tournament.txt format
+    :param tours_per_block: how many tours are put into one block
+    :return: generator of lists of lines
+    """
+    block = []
+    tours = 0
+    for line in lines:
+        if line.startswith('### Tour'):
+            if tours == tours_per_block or (block and not tours):
+                yield block
+                block = []
+                tours = 0
+            tours += 1
+        block.append(line)
+    if block:
+        yield block
+
+
+def score_block(lines, local_rules=True, scorer=be.score_game):
+    """ Parse and score one block of tours, tours are numbered from 1 inside the block"""
+    return list(score_records(parse_lines(lines), local_rules=local_rules, scorer=scorer))
+
+
+def parallel_records(lines, local_rules=True, scorer=be.score_game, tour_counter=0, workers=2,
+                     tours_per_block=64, threads=False):
+    """
+    Parse and score tours in worker processes, records are given back in the original order
+    :param lines: iterable of lines in tournament.txt format
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :param scorer: picklable function (result, local_rules) -> (points, error code),
+        with threads it is called from many threads at once, e.g. bowling_engine.score_game
+    :param tour_counter: how many tours were before, tours are numbered after it
+    :param workers: amount of worker processes or threads
+    :param tours_per_block: how many tours are sent to a worker at once
+    :param threads: score in worker threads instead of processes, lines are read and report is written
+        by the calling thread while blocks are scored
+    :return: generator of scored records, the same as score_records(parse_lines(lines)) gives
+    """
+    tasks = ((block, local_rules, scorer) for block in split_tours(lines, tours_per_block))
+    return renumber_blocks(ordered_map(score_block, tasks, workers, threads=threads), tour_counter)
+
+
+def ordered_map(function, tasks, workers, threads=False):
+    """
+    Call function(*task) in worker processes, no more than 2 * workers tasks are pending at once
+    :param threads: use worker threads instead of processes, function must be thread-safe
+    :return: generator of results in the order of tasks
+    """
+    # executors take long to import, they are needed only with workers
+    if threads:
+        from concurrent.futures import ThreadPoolExecutor as Executor
+    else:
+        from concurrent.futures import ProcessPoolExecutor as Executor
+    with Executor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def renumber_blocks(blocks, tour_counter=0):
+    """
+    Join records of blocks scored separately, tours get numbers through the whole file
+    :param blocks: iterable of record lists, tours are numbered from 1 inside each block
+    :param tour_counter: how many tours were before the first block
+    """
+    for records in blocks:
+        tour_counter = yield from _renumbered(records, tour_counter)
+
+
+def _renumbered(records, tour_counter):
+    """ Shift tour numbers of block records by amount of tours before the block"""
+    tours = tour_counter
+    for record in records:
+        if type(record) is TourStart:
+            tours = tour_counter + record.number
+            record = TourStart(tours)
+        elif type(record) is TourEnd:
+            record = TourEnd(tour_counter + record.number)
+        yield record
+    return tours
+
+
+class Rejects:
+    """
+    Player results that break the game rules: they are counted and written to the sink if it is given.
+    """
+
+    def __init__(self, sink=None, local_rules=True):
+        """
+        :param sink: any object with write() method, e.g. file or ReportWriter
+        :param local_rules: rules used for counting, needed to find the wrong throw
+        """
+        self.sink = sink
+        self.local_rules = local_rules
+        self.count = 0
+
+    def add(self, record):
+        self.count += 1
+        if self.sink is not None:
+            error, position = be.validate(record.result, local_rules=self.local_rules)
+            self.sink.write(f'{record.name} {record.result} {be.error_message(error, position)}\n')
+
+
+def reject_invalid(records, rejects):
+    """
+    Take incorrect player results out of the stream, they are not scored and not counted in standings
+    :param records: records from score_records
+    :param rejects: Rejects where incorrect results go
+    """
+    for record in records:
+        if type(record) is PlayerResult and record.error:
+            rejects.add(record)
+            continue
+        yield record
+
+
+class Standings:
+    """
+    Tournament standings updated with every result: games played, victories, total points and best game
+    of each player. Tour winner is the best result of the current tour, on a tie the result that came first wins.
+    """
+
+    def __init__(self):
+        self.tours = 0
+        self.tour_results = {}
+        self.player_played = {}
+        self.player_winner = {}
+        self.player_points = {}
+        self.player_best = {}
+        self._leader = None
+        self._leader_points = None
+
+    def add_result(self, name, result, points):
+        self.tour_results[name] = [result, points]
+        if name in self.player_played:
+            self.player_played[name] += 1
+            self.player_points[name] += points
+            if points > self.player_best[name]:
+                self.player_best[name] = points
+        else:
+            self.player_played[name] = 1
+            self.player_winner[name] = 0
+            self.player_points[name] = points
+            self.player_best[name] = points
+        if self._leader is None or points > self._leader_points:
+            self._leader = name
+            self._leader_points = points
+
+    def start_tour(self, number):
+        """ Start a tour, results of the previous tour that had no winner line give no victory"""
+        self.tours = number
+        self.tour_results.clear()
+        self._leader = None
+        self._leader_points = None
+
+    def finish_tour(self):
+        """
+        Give victory to the tour leader and start a new tour
+        :return: winner name or None if there were no results
+        """
+        winner = self._leader
+        if winner is not None:
+            self.player_winner[winner] += 1
+        self.tour_results.clear()
+        self._leader = None
+        self._leader_points = None
+        return winner
+
+    def add_tour(self, results, winner):
+        """
+        Add a tour that was counted before
+        :param results: list of (name, points) of the tour
+        :param winner: winner name or None
+        """
+        for name, points in results:
+            if name in self.player_played:
+                self.player_played[name] += 1
+                self.player_points[name] += points
+                if points > self.player_best[name]:
+                    self.player_best[name] = points
+            else:
+                self.player_played[name] = 1
+                self.player_winner[name] = 0
+                self.player_points[name] = points
+                self.player_best[name] = points
+        if winner is not None:
+            self.player_winner[winner] += 1
+
+    def remove_tour(self, results, winner):
+        """
+        Take back a tour added before, players without games are removed.
+        Best game is not changed, it can't be found without other games of the player.
+        """
+        if winner is not None:
+            self.player_winner[winner] -= 1
+        for name, points in results:
+            self.player_played[name] -= 1
+            self.player_points[name] -= points
+            if not self.player_played[name]:
+                del self.player_played[name], self.player_winner[name], self.player_points[name]
+                del self.player_best[name]
+
+    def merge(self, other):
+        """ Add finished standings of another tournament, e.g. of another file"""
+        for name, played in other.player_played.items():
+            if name in self.player_played:
+                self.player_played[name] += played
+                self.player_winner[name] += other.player_winner[name]
+                self.player_points[name] += other.player_points[name]
+                if other.player_best[name] > self.player_best[name]:
+                    self.player_best[name] = other.player_best[name]
+            else:
+                self.player_played[name] = played
+                self.player_winner[name] = other.player_winner[name]
+                self.player_points[name] = other.player_points[name]
+                self.player_best[name] = other.player_best[name]
+        self.tours += other.tours
+
+    def standing(self, name):
+        """ Standing of one player: (games played, victories, total points, best game)"""
+        return self.player_played[name], self.player_winner[name], self.player_points[name], self.player_best[name]
+
+
+def aggregate_tours(records, standings):
+    """
+    Collect scored results into standings, TourEnd records are replaced with TourWinner
+    :param records: records from score_records
+    :param standings: Standings to update
+    """
+    for record in records:
+        if type(record) is PlayerResult:
+            standings.add_result(record.name, record.result, record.points)
+        elif type(record) is TourEnd:
+            record = TourWinner(record.number, standings.finish_tour())
+        elif type(record) is TourStart:
+            standings.start_tour(record.number)
+        yield record
+
+
+def report_rows(records):
+    """ Turn records into report file lines"""
+    for record in records:
+        if type(record) is PlayerResult:
+            yield f'{record.name} {record.result} {record.points}\n'
+        elif type(record) is TourStart:
+            yield f'### Tour {record.number}\n'
+        elif type(record) is TourWinner and record.name is not None:
+            yield f'winner is {record.name}\n'
+
+
+def process(lines, standings, local_rules=True, scorer=be.score_game, tour_counter=0, workers=1, rejects=None,
+            stage=None, threads=1):
+    """
+    Whole pipeline from tournament file lines to report lines
+    :param lines: iterable of lines in tournament.txt format
+    :param standings: Standings to update
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :param scorer: function (result, local_rules) -> (points, error code)
+    :param tour_counter: how many tours were before, tours are numbered after it
+    :param workers: if more than 1, tours are scored in that many processes, see parallel_records
+    :param rejects: optional Rejects, incorrect results go there instead of the report
+    :param stage: optional generator function over aggregated records, see report
+    :param threads: if more than 1 and workers are not used, tours are scored in that many threads,
+        scorer must be thread-safe
+    :return: generator of report lines
+    """
+    if workers > 1:
+        records = parallel_records(lines, local_rules=local_rules, scorer=scorer, tour_counter=tour_counter,
+                                   workers=workers)
+    elif threads > 1:
+        records = parallel_records(lines, local_rules=local_rules, scorer=scorer, tour_counter=tour_counter,
+                                   workers=threads, threads=True)
+    else:
+        records = timed('parse', parse_lines(lines, tour_counter))
+        records = timed('score', score_records(records, local_rules=local_rules, scorer=scorer))
+    return report(records, standings, rejects, stage)
+
+
+def report(records, standings, rejects=None, stage=None):
+    """
+    Report lines for scored records
+    :param records: scored records
+    :param standings: Standings to update
+    :param rejects: optional Rejects, incorrect results go there instead of the report
+    :param stage: optional generator function that gets records with tour winners before report lines are made,
+        e.g. tournament_binary.BinaryWriter.records
+    :return: generator of report lines
+    """
+    records = count_records(records)
+    if rejects is not None:
+        records = timed('reject', reject_invalid(records, rejects))
+    records = timed('winner', aggregate_tours(records, standings))
+    if stage is not None:
+        records = timed('stage', stage(records))
+    return timed('report', report_rows(records))
+
+
+def write_rows(rows, sink):
+    """
+    Send report lines to any object with write() method: file, sys.stdout, ReportWriter, socket wrapper
+    :return: amount of written lines
+    """
+    written = 0
+    write = sink.write
+    for row in rows:
+        write(row)
+        written += 1
+    return written
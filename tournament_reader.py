@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped reader for big tournament files.
+The file is not read into memory: tour blocks are found by '### Tour' headers right in the mapping,
+only player lines are decoded. Pages that were already parsed are given back to the system,
+so memory usage doesn't grow with file size.
+"""
+import mmap
+from contextlib import contextmanager
+
+import bowling_engine as be
+import tournament_pipeline as tp
+
+TOUR_HEADER = b'### Tour'
+WINNER = b'winner'
+_RELEASE_STEP = 16 * 1024 * 1024  # parsed pages are given back after every 16 MB
+
+
+@contextmanager
+def map_file(path):
+    """ Read-only mapping of the whole file, empty file gives empty bytes"""
+    with open(path, 'rb') as file:
+        try:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file can't be mapped
+            yield b''
+            return
+        with mapping:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapping
+
+
+def _header_positions(data):
+    if data.find(TOUR_HEADER, 0, len(TOUR_HEADER)) == 0:
+        yield 0
+    position = data.find(b'\n' + TOUR_HEADER)
+    while position != -1:
+        yield position + 1
+        position = data.find(b'\n' + TOUR_HEADER, position + 1)
+
+
+def block_offsets(data, tours_per_block=1):
+    """
+    Find tour blocks in the mapped file, each block starts with '### Tour' header
+    (lines before the first header make their own block)
+    :param data: mmap or bytes with tournament file content
+    :param tours_per_block: how many tours are put into one block
+    :return: generator of (start, end) byte offsets
+    """
+    start = 0
+    tours = 0
+    for position in _header_positions(data):
+        if tours == tours_per_block or (position > start and not tours):
+            yield start, position
+            start = position
+            tours = 0
+        tours += 1
+    if start < len(data):
+        yield start, len(data)
+
+
+def mapped_blocks(path, tours_per_block=1):
+    """
+    Tour blocks of the file as memoryview slices of the mapping, nothing is copied.
+    A block is valid only until the next one is taken.
+    """
+    with map_file(path) as data:
+        with memoryview(data) as view:
+            for start, end in block_offsets(data, tours_per_block):
+                with view[start:end] as block:
+                    yield block
+
+
+def parse_block(data, start=0, end=None, tour_counter=0):
+    """
+    Turn tournament file bytes into records, the same as tournament_pipeline.parse_lines does for lines
+    :param data: mmap or bytes with tournament file content
+    :param start: offset where parsing starts
+    :param end: offset where parsing ends, end of data by default
+    :param tour_counter: how many tours were before, tours are numbered after it
+    """
+    if end is None:
+        end = len(data)
+    release = getattr(data, 'madvise', None) if hasattr(mmap, 'MADV_DONTNEED') else None
+    released = start - start % mmap.PAGESIZE
+    position = start
+    while position < end:
+        line_end = data.find(b'\n', position, end)
+        if line_end == -1:
+            line_end = end
+        if data.find(TOUR_HEADER, position, position + len(TOUR_HEADER)) == position:
+            tour_counter += 1
+            yield tp.TourStart(tour_counter)
+        elif data.find(WINNER, position, position + len(WINNER)) == position:
+            yield tp.TourEnd(tour_counter)
+        else:
+            # decoded before splitting, so names and results are split on the same whitespace as in text files
+            line = data[position:line_end].decode('UTF8').split()
+            if line:
+                yield tp.PlayerResult(line[0], line[1], None, None)
+        position = line_end + 1
+        if release is not None and position - released >= _RELEASE_STEP:
+            step = (position - released) // mmap.PAGESIZE * mmap.PAGESIZE
+            release(mmap.MADV_DONTNEED, released, step)
+            released += step
+
+
+def score_file_block(path, start, end, local_rules=True, scorer=be.score_game):
+    """ Worker task: map the file, parse and score one block of tours numbered from 1"""
+    with map_file(path) as data:
+        return list(tp.score_records(parse_block(data, start, end), local_rules=local_rules, scorer=scorer))
+
+
+def mapped_records(path, local_rules=True, scorer=be.score_game, tour_counter=0, workers=1, tours_per_block=64,
+                   threads=1):
+    """
+    Scored records of a memory-mapped tournament file
+    :param path: tournament file
+    :param local_rules: counting result rules: local(True) or tournament(False)
+    :param scorer: function (result, local_rules) -> (points, error code), picklable if workers > 1
+    :param tour_counter: how many tours were before, tours are numbered after it
+    :param workers: if more than 1, blocks of tours are parsed and scored in that many processes
+    :param tours_per_block: how many tours are sent to a worker at once
+    :param threads: if more than 1 and workers are not used, blocks are scored in that many threads,
+        scorer must be thread-safe
+    """
+    with map_file(path) as data:
+        if workers > 1 or threads > 1:
+            tasks = ((path, start, end, local_rules, scorer) for start, end in block_offsets(data, tours_per_block))
+            blocks = tp.ordered_map(score_file_block, tasks, max(workers, threads), threads=workers <= 1)
+            yield from tp.renumber_blocks(blocks, tour_counter)
+        else:
+            records = tp.timed('parse', parse_block(data, tour_counter=tour_counter))
+            yield from tp.timed('score', tp.score_records(records, local_rules=local_rules, scorer=scorer))
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Statistics of a tournament collected in one pass over scored records: strike rate, spare conversion,
+average and best game of every player, score distribution of every tour and of the whole tournament.
+Counters are arrays indexed by player id (players are interned once) and by tour, so memory depends only on
+amount of players and tours, not on amount of games.
+
+Throws are not walked again: in a correct game strikes and spares are counted by str.count() and
+every symbol after the first 10 frames starts is a second throw of a frame, i.e. a chance for spare.
+"""
+import sys
+from array import array
+from math import sqrt
+
+import tournament_pipeline as tp
+
+MAX_POINTS = 300
+
+
+class TournamentStats:
+    """
+    Counters of players and tours, fed with records that tournament_pipeline.aggregate_tours gives:
+    TourStart, PlayerResult of correct games, TourWinner.
+    """
+
+    def __init__(self):
+        self.players = {}
+        self.names = []
+        self.games = array('I')
+        self.points = array('Q')
+        self.best = array('H')
+        self.strikes = array('I')
+        self.spares = array('I')
+        self.spare_chances = array('I')
+        self.wins = array('I')
+        self.first_tour = None
+        self.tour_games = array('I')
+        self.tour_points = array('Q')
+        self.tour_squares = array('Q')
+        self.tour_min = array('H')
+        self.tour_max = array('H')
+        # amount of games with every score from 0 to MAX_POINTS
+        self.histogram = array('Q', bytes(8 * (MAX_POINTS + 1)))
+
+    def player(self, name):
+        """ Player id, new players get the next one"""
+        player = self.players.get(name)
+        if player is None:
+            player = self.players[sys.intern(name)] = len(self.names)
+            self.names.append(name)
+            for column in (self.games, self.points, self.best, self.strikes, self.spares, self.spare_chances,
+                           self.wins):
+                column.append(0)
+        return player
+
+    def add(self, record):
+        """ Add one record, other record types are skipped"""
+        if type(record) is tp.PlayerResult:
+            self.add_game(record.name, record.result, record.points)
+        elif type(record) is tp.TourStart:
+            self.start_tour(record.number)
+        elif type(record) is tp.TourWinner and record.name is not None:
+            self.wins[self.player(record.name)] += 1
+
+    def records(self, records):
+        """ Pass records through as they are, adding every one of them"""
+        add = self.add
+        for record in records:
+            add(record)
+            yield record
+
+    def start_tour(self, number):
+        if self.first_tour is None:
+            self.first_tour = number
+        self.tour_games.append(0)
+        self.tour_points.append(0)
+        self.tour_squares.append(0)
+        self.tour_min.append(0)
+        self.tour_max.append(0)
+
+    def add_game(self, name, result, points):
+        """ Count one correct game of the player"""
+        player = self.player(name)
+        self.games[player] += 1
+        self.points[player] += points
+        if points > self.best[player]:
+            self.best[player] = points
+        self.strikes[player] += result.count('X') + result.count('x')
+        self.spares[player] += result.count('/')
+        self.spare_chances[player] += len(result) - 10
+        self.histogram[min(points, MAX_POINTS)] += 1
+        if self.tour_games:
+            tour = len(self.tour_games) - 1
+            if not self.tour_games[tour] or points < self.tour_min[tour]:
+                self.tour_min[tour] = points
+            if points > self.tour_max[tour]:
+                self.tour_max[tour] = points
+            self.tour_games[tour] += 1
+            self.tour_points[tour] += points
+            self.tour_squares[tour] += points * points
+
+    def merge(self, other):
+        """ Add statistics of another tournament, e.g. of another file, its tours go after tours of this one"""
+        for other_player, name in enumerate(other.names):
+            player = self.player(name)
+            self.games[player] += other.games[other_player]
+            self.points[player] += other.points[other_player]
+            self.best[player] = max(self.best[player], other.best[other_player])
+            self.strikes[player] += other.strikes[other_player]
+            self.spares[player] += other.spares[other_player]
+            self.spare_chances[player] += other.spare_chances[other_player]
+            self.wins[player] += other.wins[other_player]
+        if other.first_tour is not None and self.first_tour is None:
+            self.first_tour = 1
+        self.tour_games.extend(other.tour_games)
+        self.tour_points.extend(other.tour_points)
+        self.tour_squares.extend(other.tour_squares)
+        self.tour_min.extend(other.tour_min)
+        self.tour_max.extend(other.tour_max)
+        for points, amount in enumerate(other.histogram):
+            self.histogram[points] += amount
+
+    def player_stats(self, name):
+        """
+        Statistics of one player
+        :return: dict with games, wins, average, best, strike_rate (strikes per frame),
+            spare_rate (spares per frame that was not a strike and had a second throw)
+        """
+        player = self.players[name]
+        games = self.games[player]
+        chances = self.spare_chances[player]
+        return {
+            'name': name,
+            'games': games,
+            'wins': self.wins[player],
+            'average': self.points[player] / games if games else 0.0,
+            'best': self.best[player],
+            'strike_rate': self.strikes[player] / (10 * games) if games else 0.0,
+            'spare_rate': self.spares[player] / chances if chances else 0.0,
+        }
+
+    def tour_stats(self, number):
+        """
+        Score distribution of one tour
+        :param number: tour number as it is in the report
+        :return: dict with games, average, min, max and standard deviation of scores
+        """
+        tour = number - self.first_tour if self.first_tour is not None else -1
+        if not 0 <= tour < len(self.tour_games):
+            raise IndexError(f'There is no tour {number}')
+        games = self.tour_games[tour]
+        average = self.tour_points[tour] / games if games else 0.0
+        variance = self.tour_squares[tour] / games - average * average if games else 0.0
+        return {
+            'number': number,
+            'games': games,
+            'average': average,
+            'min': self.tour_min[tour],
+            'max': self.tour_max[tour],
+            'stdev': sqrt(max(variance, 0.0)),
+        }
+
+    def percentile(self, share):
+        """ Score that share (from 0 to 1) of all games did not exceed, None if there were no games"""
+        total = sum(self.histogram)
+        if not total:
+            return None
+        needed = max(1, share * total)
+        counted = 0
+        for points, amount in enumerate(self.histogram):
+            counted += amount
+            if counted >= needed:
+                return points
+        return MAX_POINTS
+
+    def player_rows(self):
+        """ Statistics of all players in order of their first game"""
+        return (self.player_stats(name) for name in self.names)
+
+    def tour_rows(self):
+        """ Score distribution of all tours in file order"""
+        if self.first_tour is None:
+            return iter(())
+        return (self.tour_stats(self.first_tour + tour) for tour in range(len(self.tour_games)))
+
+    def to_dict(self):
+        """ All statistics as plain data, e.g. for json.dump"""
+        return {
+            'players': list(self.player_rows()),
+            'tours': list(self.tour_rows()),
+            'median': self.percentile(0.5),
+            'histogram': {points: amount for points, amount in enumerate(self.histogram) if amount},
+        }
+
+    def table_rows(self):
+        """ Table lines of players sorted by average score"""
+        line = f'+{"-" * 15}+{"-" * 8}+{"-" * 8}+{"-" * 10}+{"-" * 8}+{"-" * 10}+{"-" * 10}+\n'
+        yield line
+        yield (f'|{"Player":^15}|{"Games":^8}|{"Wins":^8}|{"Average":^10}|{"Best":^8}|{"Strikes":^10}|'
+               f'{"Spares":^10}|\n')
+        yield line
+        for stats in sorted(self.player_rows(), key=lambda stats: -stats['average']):
+            yield (f'|{stats["name"]:^15}|{stats["games"]:^8}|{stats["wins"]:^8}|{stats["average"]:^10.1f}|'
+                   f'{stats["best"]:^8}|{stats["strike_rate"]:^10.1%}|{stats["spare_rate"]:^10.1%}|\n')
+        yield line
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Tournament standings table: players are ranked, one page of them is rendered as ASCII table, CSV or JSON
+and the whole text is written at once.
+When only the first players are needed (top or a page) they are taken with a heap, all players are not sorted.
+"""
+import csv
+import heapq
+import io
+import json
+import sys
+from collections import namedtuple
+from itertools import islice, starmap
+
+FORMATS = ('ascii', 'csv', 'json')
+SORT_KEYS = ('wins', 'games', 'points')
+
+Row = namedtuple('Row', 'rank name played wins points best')
+
+
+def _sort_key(standings, sort_by):
+    """ Key for ranking, on a tie the second counter decides, then the order of the first game"""
+    played, wins, points = standings.player_played, standings.player_winner, standings.player_points
+    if sort_by == 'wins':
+        return lambda name: (wins[name], points[name])
+    if sort_by == 'games':
+        return lambda name: (played[name], wins[name])
+    if sort_by == 'points':
+        return lambda name: (points[name], wins[name])
+    raise ValueError(f'Unknown sort key {sort_by}, expected one of {", ".join(SORT_KEYS)}')
+
+
+def ranked_rows(standings, sort_by='wins', top=None, page=1, page_size=None):
+    """
+    Players of one page of the table
+    :param standings: tournament_pipeline.Standings
+    :param sort_by: 'wins', 'games', 'points' or None to keep the order of the first game
+    :param top: only this many best players are in the table
+    :param page: page number from 1
+    :param page_size: players on a page, None - all players are on the first page
+    :return: list of Row, rank is the place in the whole table
+    """
+    if page < 1 or (page_size is not None and page_size < 1) or (top is not None and top < 0):
+        raise ValueError('Page and page size should be positive, top should not be negative')
+    start = (page - 1) * page_size if page_size else 0
+    end = start + page_size if page_size else None
+    if top is not None:
+        end = top if end is None else min(end, top)
+    players = standings.player_played
+    if sort_by is None:
+        names = islice(players, start, end)
+    elif end is not None and end < len(players):
+        names = heapq.nlargest(end, players, key=_sort_key(standings, sort_by))[start:]
+    else:
+        names = sorted(players, key=_sort_key(standings, sort_by), reverse=True)[start:end]
+    names = list(names)
+    columns = (standings.player_played, standings.player_winner, standings.player_points, standings.player_best)
+    return list(map(Row._make, zip(range(start + 1, start + 1 + len(names)), names,
+                                   *(map(column.__getitem__, names) for column in columns))))
+
+
+def ascii_lines(rows):
+    """
+    Table text in parts: borders, header and lines of all players in one string,
+    player column is widened for long names
+    """
+    name_width = max([15] + [len(row.name) + 2 for row in rows])
+    line = f'+{"-" * 8}+{"-" * name_width}+{"-" * 20}+{"-" * 20}+{"-" * 15}+{"-" * 12}+\n'
+    yield line
+    yield (f'|{"Rank":^8}|{"Player":^{name_width}}|{"Game played":^20}|{"Total victories":^20}|{"Points":^15}|'
+           f'{"Best game":^12}|\n')
+    yield line
+    yield ''.join(starmap(f'|{{:^8}}|{{:^{name_width}}}|{{:^20}}|{{:^20}}|{{:^15}}|{{:^12}}|\n'.format, rows))
+    yield line
+
+
+def render(rows, output_format='ascii'):
+    """
+    Text of the table
+    :param rows: list of Row, see ranked_rows
+    :param output_format: 'ascii', 'csv' or 'json'
+    """
+    if output_format == 'ascii':
+        return ''.join(ascii_lines(rows))
+    if output_format == 'csv':
+        text = io.StringIO()
+        writer = csv.writer(text, lineterminator='\n')
+        writer.writerow(Row._fields)
+        writer.writerows(rows)
+        return text.getvalue()
+    if output_format == 'json':
+        return json.dumps([row._asdict() for row in rows], ensure_ascii=False) + '\n'
+    raise ValueError(f'Unknown table format {output_format}, expected one of {", ".join(FORMATS)}')
+
+
+def write_table(standings, stream=None, output_format='ascii', sort_by='wins', top=None, page=1, page_size=None):
+    """
+    Render one page of standings and write it with one write() call
+    :param stream: any object with write() method, sys.stdout by default
+    :return: amount of players in the table
+    """
+    rows = ranked_rows(standings, sort_by=sort_by, top=top, page=page, page_size=page_size)
+    (stream or sys.stdout).write(render(rows, output_format))
+    return len(rows)